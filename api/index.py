@@ -3,13 +3,18 @@ FastAPI web application for Vercel deployment
 Provides the same functionality as the Textual TUI in a web interface
 """
 from fastapi import FastAPI, Request, Form, HTTPException
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-import json
+from jinja2 import FileSystemBytecodeCache
+import asyncio
+import atexit
+import orjson
+import re
 import sys
 import os
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
 
 # Add parent directory to path
 parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -18,14 +23,58 @@ sys.path.insert(0, parent_dir)
 from finance_core import FinancialAnalyzer
 from comprehensive_analyzer import ComprehensiveAnalyzer
 
-app = FastAPI(title="Financial Research Agent", description="Professional Stock Analysis Platform")
+app = FastAPI(
+    title="Financial Research Agent",
+    description="Professional Stock Analysis Platform",
+    default_response_class=ORJSONResponse
+)
 
-# Templates
+# orjson options for payloads that may carry numpy scalars
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+# Templates: cache compiled bytecode on disk and skip mtime checks per render
 templates = Jinja2Templates(directory=os.path.join(os.path.dirname(__file__), "templates"))
+templates.env.bytecode_cache = FileSystemBytecodeCache()
+templates.env.auto_reload = False
 
 # Initialize analyzers
 analyzer = FinancialAnalyzer()
-comprehensive_analyzer = ComprehensiveAnalyzer()
+comprehensive_analyzer = ComprehensiveAnalyzer(analyzer)
+
+# Dedicated pool for blocking analyzer calls, sized to what the upstream APIs tolerate
+# rather than the default executor's cpu-based size
+ANALYZER_POOL = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("ANALYZER_WORKERS", 8)),
+    thread_name_prefix="analyzer"
+)
+atexit.register(ANALYZER_POOL.shutdown, wait=False)
+
+# Ticker symbols: optional index caret, then up to 10 letters/digits/./-/= (e.g. BRK-B, ^GSPC, EURUSD=X)
+SYMBOL_PATTERN = re.compile(r"\^?[A-Z0-9][A-Z0-9.=\-]{0,9}")
+
+def _validate_symbol(symbol: str) -> str:
+    """Normalize a ticker and reject malformed input before any network call"""
+    symbol = symbol.upper().strip()
+    if not SYMBOL_PATTERN.fullmatch(symbol):
+        raise HTTPException(status_code=400, detail="Invalid ticker symbol")
+    return symbol
+
+async def _gather_analyses(symbol: str, comprehensive: bool):
+    """Run the blocking analyzer calls concurrently off the event loop"""
+    loop = asyncio.get_running_loop()
+    tasks = [
+        loop.run_in_executor(ANALYZER_POOL, analyzer.get_stock_data, symbol),
+        loop.run_in_executor(ANALYZER_POOL, analyzer.analyze_fundamentals, symbol),
+        loop.run_in_executor(ANALYZER_POOL, analyzer.analyze_technicals, symbol),
+        loop.run_in_executor(ANALYZER_POOL, analyzer.analyze_sentiment, symbol),
+    ]
+    if comprehensive:
+        tasks.append(loop.run_in_executor(ANALYZER_POOL, comprehensive_analyzer.perform_comprehensive_analysis, symbol))
+    
+    results = await asyncio.gather(*tasks)
+    if not comprehensive:
+        results.append(None)
+    return results
 
 @app.get("/", response_class=HTMLResponse)
 async def home(request: Request):
@@ -39,122 +88,275 @@ async def analyze_stock(
     analysis_mode: str = Form(...)
 ):
     """Analyze a stock symbol"""
+    symbol = _validate_symbol(symbol)
+    
     try:
-        symbol = symbol.upper().strip()
-        
-        if not symbol or len(symbol) > 10:
-            raise HTTPException(status_code=400, detail="Invalid ticker symbol")
-        
-        # Basic analysis
-        stock_data = analyzer.get_stock_data(symbol)
-        fundamentals = analyzer.analyze_fundamentals(symbol)
-        technicals = analyzer.analyze_technicals(symbol)
-        sentiment = analyzer.analyze_sentiment(symbol)
-        recommendation = analyzer.generate_recommendation(symbol, fundamentals, technicals, sentiment)
-        
-        # Comprehensive analysis if requested
-        comprehensive = None
-        if analysis_mode == "comprehensive":
-            comprehensive = comprehensive_analyzer.perform_comprehensive_analysis(symbol)
-        
-        results = {
-            "stock_data": stock_data,
-            "fundamentals": fundamentals,
-            "technicals": technicals,
-            "sentiment": sentiment,
-            "recommendation": recommendation,
-            "comprehensive": comprehensive,
-            "symbol": symbol,
-            "analysis_mode": analysis_mode
-        }
-        
-        return templates.TemplateResponse("results.html", {
-            "request": request,
-            "results": results,
-            "json_results": json.dumps(results, default=str)
-        })
-        
+        # Run the independent analyses concurrently in the thread pool
+        stock_data, fundamentals, technicals, sentiment, comprehensive = await _gather_analyses(
+            symbol, analysis_mode == "comprehensive"
+        )
+        recommendation = await asyncio.get_running_loop().run_in_executor(
+            ANALYZER_POOL, analyzer.generate_recommendation, stock_data, fundamentals, technicals, sentiment
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
+    
+    results = {
+        "stock_data": stock_data,
+        "fundamentals": fundamentals,
+        "technicals": technicals,
+        "sentiment": sentiment,
+        "recommendation": recommendation,
+        "comprehensive": comprehensive,
+        "symbol": symbol,
+        "analysis_mode": analysis_mode
+    }
+    
+    return templates.TemplateResponse("results.html", {
+        "request": request,
+        "results": results
+    })
+
+def _stock_data_payload(stock_data) -> Dict[str, Any]:
+    return {
+        "name": stock_data.name,
+        "current_price": stock_data.current_price,
+        "change_percent": stock_data.change_percent,
+        "market_cap": stock_data.market_cap,
+        "volume": stock_data.volume
+    }
+
+def _recommendation_payload(recommendation) -> Dict[str, Any]:
+    return {
+        "action": recommendation.action,
+        "confidence": recommendation.confidence,
+        "overall_score": recommendation.overall_score,
+        "risk_level": recommendation.risk_level,
+        "reasoning": recommendation.reasoning
+    }
+
+def _fundamentals_payload(fundamentals) -> Dict[str, Any]:
+    return {
+        "pe_ratio": fundamentals.pe_ratio,
+        "roe": fundamentals.roe,
+        "debt_to_equity": fundamentals.debt_to_equity,
+        "revenue_growth": fundamentals.revenue_growth,
+        "score": fundamentals.score
+    }
+
+def _technicals_payload(technicals) -> Dict[str, Any]:
+    return {
+        "rsi": technicals.rsi,
+        "trend": technicals.trend,
+        "score": technicals.score
+    }
+
+def _sentiment_payload(sentiment) -> Dict[str, Any]:
+    return {
+        "score": sentiment.score,
+        "analyst_rating": sentiment.analyst_rating,
+        "analyst_count": sentiment.analyst_count
+    }
+
+def _comprehensive_payload(comprehensive) -> Dict[str, Any]:
+    return {
+        "composite_score": comprehensive.composite_score,
+        "confidence_level": comprehensive.confidence_level,
+        "financial_health": {
+            "piotroski_score": comprehensive.financial_health.piotroski_score,
+            "altman_z_score": comprehensive.financial_health.altman_z_score,
+            "score": comprehensive.financial_health.score
+        },
+        "risk_metrics": {
+            "beta": comprehensive.risk_metrics.beta,
+            "sharpe_ratio": comprehensive.risk_metrics.sharpe_ratio,
+            "max_drawdown": comprehensive.risk_metrics.max_drawdown,
+            "risk_score": comprehensive.risk_metrics.risk_score
+        },
+        "valuation_metrics": {
+            "dcf_estimate": comprehensive.valuation_metrics.dcf_estimate,
+            "graham_number": comprehensive.valuation_metrics.graham_number,
+            "valuation_score": comprehensive.valuation_metrics.valuation_score
+        },
+        "key_insights": comprehensive.key_insights,
+        "warnings": comprehensive.warnings
+    }
+
+# Section name -> payload builder for the streamed API response
+SECTION_PAYLOADS = {
+    "stock_data": _stock_data_payload,
+    "recommendation": _recommendation_payload,
+    "fundamentals": _fundamentals_payload,
+    "technicals": _technicals_payload,
+    "sentiment": _sentiment_payload,
+    "comprehensive": _comprehensive_payload,
+}
+
+def _start_api_analysis(symbol: str, mode: str) -> Dict[str, asyncio.Future]:
+    """Schedule every analysis section and return a future per section"""
+    loop = asyncio.get_running_loop()
+    stock_data = loop.run_in_executor(ANALYZER_POOL, analyzer.get_stock_data, symbol)
+    fundamentals = loop.run_in_executor(ANALYZER_POOL, analyzer.analyze_fundamentals, symbol)
+    technicals = loop.run_in_executor(ANALYZER_POOL, analyzer.analyze_technicals, symbol)
+    sentiment = loop.run_in_executor(ANALYZER_POOL, analyzer.analyze_sentiment, symbol)
+    
+    async def recommend():
+        # Depends on the quote and the three scored sections
+        results = await asyncio.gather(stock_data, fundamentals, technicals, sentiment)
+        return await loop.run_in_executor(ANALYZER_POOL, analyzer.generate_recommendation, *results)
+    
+    sections = {
+        "stock_data": stock_data,
+        "fundamentals": fundamentals,
+        "technicals": technicals,
+        "sentiment": sentiment,
+        "recommendation": loop.create_task(recommend()),
+    }
+    if mode == "comprehensive":
+        sections["comprehensive"] = loop.run_in_executor(
+            ANALYZER_POOL, comprehensive_analyzer.perform_comprehensive_analysis, symbol
+        )
+    return sections
+
+async def _abandon_sections(sections: Dict[str, asyncio.Future]) -> None:
+    """Cancel the sections of a failed analysis and retrieve their outcomes"""
+    for future in sections.values():
+        future.cancel()
+    # Retrieving the exceptions keeps them out of "never retrieved" loop warnings
+    await asyncio.gather(*sections.values(), return_exceptions=True)
+
+async def _await_section(name: str, future: asyncio.Future) -> Tuple[str, Any]:
+    # Shield so a disconnecting client cannot cancel a section shared with other requests
+    return name, await asyncio.shield(future)
+
+async def _stream_api_analysis(symbol: str, stock_data, sections: Dict[str, asyncio.Future]):
+    """Yield the JSON response one section at a time as each analysis resolves"""
+    yield b'{"symbol":' + orjson.dumps(symbol)
+    yield b',"stock_data":' + orjson.dumps(_stock_data_payload(stock_data), default=str, option=ORJSON_OPTIONS)
+    
+    pending = [_await_section(name, future) for name, future in sections.items() if name != "stock_data"]
+    try:
+        for next_section in asyncio.as_completed(pending):
+            name, value = await next_section
+            yield b',"' + name.encode() + b'":' + orjson.dumps(
+                SECTION_PAYLOADS[name](value), default=str, option=ORJSON_OPTIONS
+            )
+    except Exception as e:
+        # Headers are already sent, so report the failure inside the document
+        yield b',"error":' + orjson.dumps(f"Analysis failed: {str(e)}")
+    yield b'}'
+
+class AnalysisBatcher:
+    """Coalesces concurrent API requests for the same (symbol, mode)
+    
+    Requests arriving within a short window are grouped by key and each
+    group is analyzed once, with the result fanned out to every waiter.
+    """
+    
+    def __init__(self, max_wait: float = 0.02, max_batch_size: int = 64):
+        self.max_wait = max_wait
+        self.max_batch_size = max_batch_size
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+    
+    def start(self) -> None:
+        """Start the background batch worker on the running loop"""
+        if self._worker is None:
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.get_running_loop().create_task(self._batch_worker())
+    
+    async def stop(self) -> None:
+        """Cancel the background batch worker"""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+    
+    async def submit(self, symbol: str, mode: str) -> Dict[str, asyncio.Future]:
+        """Queue a request and wait for its (possibly shared) section futures"""
+        if self._worker is None:
+            self.start()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put(((symbol, mode), future))
+        return await future
+    
+    async def _batch_worker(self) -> None:
+        """Drain the queue in short windows and dispatch one analysis per key"""
+        loop = asyncio.get_running_loop()
+        while True:
+            first = await self._queue.get()
+            batch = [first]
+            deadline = loop.time() + self.max_wait
+            
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            groups: Dict[Tuple[str, str], List[asyncio.Future]] = {}
+            for key, future in batch:
+                groups.setdefault(key, []).append(future)
+            
+            for key, futures in groups.items():
+                loop.create_task(self._resolve(key, futures))
+    
+    async def _resolve(self, key: Tuple[str, str], futures: List[asyncio.Future]) -> None:
+        """Start a single analysis and hand its section futures to every waiter"""
+        try:
+            result = _start_api_analysis(*key)
+        except Exception as e:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            for future in futures:
+                if not future.done():
+                    future.set_result(result)
+
+batcher = AnalysisBatcher()
+
+@app.on_event("startup")
+async def start_batcher():
+    batcher.start()
+
+@app.on_event("startup")
+async def warm_templates():
+    # Compile every template once so the first request skips lexing/parsing
+    for name in templates.env.list_templates():
+        templates.get_template(name)
+
+@app.on_event("shutdown")
+async def stop_batcher():
+    await batcher.stop()
 
 @app.get("/api/analyze/{symbol}")
 async def api_analyze(symbol: str, mode: str = "standard"):
     """API endpoint for stock analysis"""
+    symbol = _validate_symbol(symbol)
+    
+    try:
+        sections = await batcher.submit(symbol, mode)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
+    
     try:
-        symbol = symbol.upper().strip()
-        
-        # Basic analysis
-        stock_data = analyzer.get_stock_data(symbol)
-        fundamentals = analyzer.analyze_fundamentals(symbol)
-        technicals = analyzer.analyze_technicals(symbol)
-        sentiment = analyzer.analyze_sentiment(symbol)
-        recommendation = analyzer.generate_recommendation(symbol, fundamentals, technicals, sentiment)
-        
-        results = {
-            "symbol": symbol,
-            "stock_data": {
-                "name": stock_data.name,
-                "current_price": stock_data.current_price,
-                "change_percent": stock_data.change_percent,
-                "market_cap": stock_data.market_cap,
-                "volume": stock_data.volume
-            },
-            "recommendation": {
-                "action": recommendation.action,
-                "confidence": recommendation.confidence,
-                "overall_score": recommendation.overall_score,
-                "risk_level": recommendation.risk_level,
-                "reasoning": recommendation.reasoning
-            },
-            "fundamentals": {
-                "pe_ratio": fundamentals.pe_ratio,
-                "roe": fundamentals.roe,
-                "debt_to_equity": fundamentals.debt_to_equity,
-                "revenue_growth": fundamentals.revenue_growth,
-                "score": fundamentals.score
-            },
-            "technicals": {
-                "rsi": technicals.rsi,
-                "trend": technicals.trend,
-                "score": technicals.score
-            },
-            "sentiment": {
-                "score": sentiment.score,
-                "analyst_rating": sentiment.analyst_rating,
-                "analyst_count": sentiment.analyst_count
-            }
-        }
-        
-        # Add comprehensive analysis if requested
-        if mode == "comprehensive":
-            comprehensive = comprehensive_analyzer.perform_comprehensive_analysis(symbol)
-            results["comprehensive"] = {
-                "composite_score": comprehensive.composite_score,
-                "confidence_level": comprehensive.confidence_level,
-                "financial_health": {
-                    "piotroski_score": comprehensive.financial_health.piotroski_score,
-                    "altman_z_score": comprehensive.financial_health.altman_z_score,
-                    "score": comprehensive.financial_health.score
-                },
-                "risk_metrics": {
-                    "beta": comprehensive.risk_metrics.beta,
-                    "sharpe_ratio": comprehensive.risk_metrics.sharpe_ratio,
-                    "max_drawdown": comprehensive.risk_metrics.max_drawdown,
-                    "risk_score": comprehensive.risk_metrics.risk_score
-                },
-                "valuation_metrics": {
-                    "dcf_estimate": comprehensive.valuation_metrics.dcf_estimate,
-                    "graham_number": comprehensive.valuation_metrics.graham_number,
-                    "valuation_score": comprehensive.valuation_metrics.valuation_score
-                },
-                "key_insights": comprehensive.key_insights,
-                "warnings": comprehensive.warnings
-            }
-        
-        return results
-        
+        # Resolve stock data up front so an unknown symbol still fails with a 500
+        stock_data = await asyncio.shield(sections["stock_data"])
     except Exception as e:
+        await _abandon_sections(sections)
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
+    
+    return StreamingResponse(
+        _stream_api_analysis(symbol, stock_data, sections),
+        media_type="application/json"
+    )
 
 # Health check
 @app.get("/health")
@@ -2,10 +2,17 @@
 Data caching system for Financial Research Agents
 Reduces API calls and improves performance
 """
-import json
+import asyncio
+import orjson
+import os
+import sqlite3
+import threading
 import time
+import zlib
 from pathlib import Path
-from typing import Dict, Any, Optional, Union
+from typing import Dict, Any, Optional, Tuple, Union
+from collections import OrderedDict
+from functools import lru_cache
 from datetime import datetime, timedelta
 from dataclasses import dataclass, asdict
 import hashlib
@@ -13,7 +20,33 @@ import hashlib
 from config import config_manager
 
 
-@dataclass
+# orjson options shared by every cache read/write path
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+# Sentinel for a miss in the in-memory layer (None is a valid cached value)
+_MISSING = object()
+
+# Payloads larger than this are zlib-compressed before hitting the database
+COMPRESS_THRESHOLD = 8192
+
+
+def _encode_payload(data: Any) -> bytes:
+    """Serialize cache data to a compact binary blob"""
+    blob = orjson.dumps(data, default=str, option=ORJSON_OPTIONS)
+    if len(blob) > COMPRESS_THRESHOLD:
+        blob = zlib.compress(blob, 1)
+    return blob
+
+
+def _decode_payload(blob: bytes) -> Any:
+    """Inverse of _encode_payload"""
+    # A zlib stream starts with 0x78 ('x'), which no JSON document can
+    if blob[:1] == b'x':
+        blob = zlib.decompress(blob)
+    return orjson.loads(blob)
+
+
+@dataclass(slots=True)
 class CacheEntry:
     """Cache entry with metadata"""
     data: Any
@@ -31,27 +64,6 @@ class CacheEntry:
     def age_minutes(self) -> float:
         """Get age of cache entry in minutes"""
         return (time.time() - self.timestamp) / 60
-    
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for JSON serialization"""
-        return {
-            'data': self.data,
-            'timestamp': self.timestamp,
-            'expires_at': self.expires_at,
-            'symbol': self.symbol,
-            'data_type': self.data_type
-        }
-    
-    @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> 'CacheEntry':
-        """Create from dictionary"""
-        return cls(
-            data=data['data'],
-            timestamp=data['timestamp'],
-            expires_at=data['expires_at'],
-            symbol=data['symbol'],
-            data_type=data['data_type']
-        )
 
 
 class CacheManager:
@@ -59,6 +71,7 @@ class CacheManager:
     
     def __init__(self):
         self.cache_dir = config_manager.cache_dir
+        self.db_path = self.cache_dir / 'cache.db'
         self.default_duration = 300  # 5 minutes default
         
         # Different cache durations for different data types
@@ -69,14 +82,81 @@ class CacheManager:
             'sentiment': 1800,      # 30 minutes - sentiment data updates periodically
             'info': 86400,         # 24 hours - company info rarely changes
         }
+        
+        # In-process LRU layer in front of the disk cache: key -> (expires_at, encoded blob).
+        # Holding the blob means memory and disk hits decode to the same types, and every
+        # caller gets its own copy to mutate
+        self.memory_cache_size = 512
+        self._memory_cache: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        # Guards the LRU layer: it is used from the event loop (aget) and from worker threads
+        self._memory_lock = threading.Lock()
+        
+        # Single SQLite store shared by all entries (analyzers call in from worker threads)
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_pid: Optional[int] = None
+        self._connect()
+    
+    def _connect(self) -> None:
+        """Open the cache database for the current process"""
+        self._conn = sqlite3.connect(str(self.db_path), isolation_level=None, check_same_thread=False)
+        self._conn_pid = os.getpid()
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, symbol TEXT NOT NULL, data_type TEXT NOT NULL, "
+            "timestamp REAL NOT NULL, expires_at REAL NOT NULL, blob BLOB NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_expires_at ON cache(expires_at)")
+        # Covering index: metadata queries are answered without reading payload pages
+        self._conn.execute("DROP INDEX IF EXISTS idx_cache_symbol")
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_cache_meta ON cache(symbol, data_type, expires_at)"
+        )
     
-    def _get_cache_key(self, symbol: str, data_type: str) -> str:
-        """Generate cache key for symbol and data type"""
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _get_cache_key(symbol: str, data_type: str) -> str:
+        """Generate cache key for symbol and data type
+        
+        Memoized so repeat lookups reuse one string object whose hash is
+        already computed for the in-memory layer's dict operations.
+        """
         return f"{symbol}_{data_type}"
     
-    def _get_cache_file(self, cache_key: str) -> Path:
-        """Get cache file path"""
-        return self.cache_dir / f"{cache_key}.json"
+    def _execute(self, sql: str, params: tuple = ()) -> sqlite3.Cursor:
+        """Run a statement against the cache database"""
+        with self._lock:
+            # SQLite handles must not cross fork(); preloaded app servers fork after import
+            if self._conn_pid != os.getpid():
+                self._connect()
+            return self._conn.execute(sql, params)
+    
+    def _remember(self, cache_key: str, expires_at: float, blob: bytes) -> None:
+        """Store an encoded entry in the in-memory LRU layer"""
+        with self._memory_lock:
+            self._memory_cache[cache_key] = (expires_at, blob)
+            self._memory_cache.move_to_end(cache_key)
+            while len(self._memory_cache) > self.memory_cache_size:
+                self._memory_cache.popitem(last=False)
+    
+    def _forget(self, cache_key: str) -> None:
+        """Drop an entry from the in-memory LRU layer"""
+        with self._memory_lock:
+            self._memory_cache.pop(cache_key, None)
+    
+    def _recall(self, cache_key: str) -> Any:
+        """Look up and decode a live entry in the in-memory LRU layer, or _MISSING"""
+        with self._memory_lock:
+            cached = self._memory_cache.get(cache_key)
+            if cached is None:
+                return _MISSING
+            if cached[0] <= time.time():
+                del self._memory_cache[cache_key]
+                return _MISSING
+            self._memory_cache.move_to_end(cache_key)
+        return _decode_payload(cached[1])
     
     def set(self, symbol: str, data_type: str, data: Any, duration: Optional[int] = None) -> None:
         """Store data in cache"""
@@ -84,49 +164,70 @@ class CacheManager:
             duration = self.cache_durations.get(data_type, self.default_duration)
         
         cache_key = self._get_cache_key(symbol, data_type)
-        cache_file = self._get_cache_file(cache_key)
         
+        now = time.time()
         entry = CacheEntry(
             data=data,
-            timestamp=time.time(),
-            expires_at=time.time() + duration,
+            timestamp=now,
+            expires_at=now + duration,
             symbol=symbol.upper(),
             data_type=data_type
         )
         
         try:
-            with open(cache_file, 'w') as f:
-                json.dump(entry.to_dict(), f, indent=2, default=str)
+            blob = _encode_payload(entry.data)
+            self._remember(cache_key, entry.expires_at, blob)
+            self._execute(
+                "INSERT OR REPLACE INTO cache (key, symbol, data_type, timestamp, expires_at, blob) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (cache_key, entry.symbol, entry.data_type, entry.timestamp, entry.expires_at, blob)
+            )
         except Exception as e:
             print(f"Warning: Failed to save cache for {symbol} {data_type}: {e}")
     
     def get(self, symbol: str, data_type: str) -> Optional[Any]:
         """Retrieve data from cache if valid"""
         cache_key = self._get_cache_key(symbol, data_type)
-        cache_file = self._get_cache_file(cache_key)
         
-        if not cache_file.exists():
-            return None
+        # Serve from memory when possible to skip the database round trip
+        data = self._recall(cache_key)
+        if data is not _MISSING:
+            return data
         
         try:
-            with open(cache_file, 'r') as f:
-                data = json.load(f)
-            
-            entry = CacheEntry.from_dict(data)
+            row = self._execute(
+                "SELECT blob, expires_at FROM cache WHERE key = ?", (cache_key,)
+            ).fetchone()
+            if row is None:
+                return None
             
-            if entry.is_expired:
+            blob, expires_at = row
+            if time.time() > expires_at:
                 # Clean up expired cache
-                cache_file.unlink(missing_ok=True)
+                self._execute("DELETE FROM cache WHERE key = ?", (cache_key,))
                 return None
             
-            return entry.data
+            data = _decode_payload(blob)
+            self._remember(cache_key, expires_at, blob)
+            return data
             
         except Exception as e:
             print(f"Warning: Failed to load cache for {symbol} {data_type}: {e}")
-            # Clean up corrupted cache file
-            cache_file.unlink(missing_ok=True)
+            # Clean up corrupted cache entry
+            self._execute("DELETE FROM cache WHERE key = ?", (cache_key,))
             return None
     
+    async def aget(self, symbol: str, data_type: str) -> Optional[Any]:
+        """Async get() for event-loop callers; database reads run in a worker thread"""
+        data = self._recall(self._get_cache_key(symbol, data_type))
+        if data is not _MISSING:
+            return data
+        return await asyncio.to_thread(self.get, symbol, data_type)
+    
+    async def aset(self, symbol: str, data_type: str, data: Any, duration: Optional[int] = None) -> None:
+        """Async set() for event-loop callers; the database write runs in a worker thread"""
+        await asyncio.to_thread(self.set, symbol, data_type, data, duration)
+    
     def has_valid_cache(self, symbol: str, data_type: str) -> bool:
         """Check if valid cache exists"""
         return self.get(symbol, data_type) is not None
@@ -135,44 +236,30 @@ class CacheManager:
         """Invalidate cache for symbol"""
         if data_type:
             # Invalidate specific data type
-            cache_key = self._get_cache_key(symbol, data_type)
-            cache_file = self._get_cache_file(cache_key)
-            cache_file.unlink(missing_ok=True)
+            cache_keys = [self._get_cache_key(symbol, data_type)]
         else:
             # Invalidate all data for symbol
-            for data_type in self.cache_durations.keys():
-                cache_key = self._get_cache_key(symbol, data_type)
-                cache_file = self._get_cache_file(cache_key)
-                cache_file.unlink(missing_ok=True)
+            cache_keys = [self._get_cache_key(symbol, dt) for dt in self.cache_durations.keys()]
+        
+        for cache_key in cache_keys:
+            self._forget(cache_key)
+        placeholders = ", ".join("?" * len(cache_keys))
+        self._execute(f"DELETE FROM cache WHERE key IN ({placeholders})", tuple(cache_keys))
     
     def clear_expired(self) -> int:
         """Clear all expired cache entries"""
-        expired_count = 0
+        now = time.time()
+        with self._memory_lock:
+            for cache_key in [k for k, (expires_at, _) in self._memory_cache.items() if expires_at <= now]:
+                del self._memory_cache[cache_key]
         
-        for cache_file in self.cache_dir.glob("*.json"):
-            try:
-                with open(cache_file, 'r') as f:
-                    data = json.load(f)
-                
-                entry = CacheEntry.from_dict(data)
-                if entry.is_expired:
-                    cache_file.unlink()
-                    expired_count += 1
-                    
-            except Exception:
-                # Remove corrupted files
-                cache_file.unlink(missing_ok=True)
-                expired_count += 1
-        
-        return expired_count
+        return self._execute("DELETE FROM cache WHERE expires_at < ?", (now,)).rowcount
     
     def clear_all(self) -> int:
         """Clear all cache entries"""
-        count = 0
-        for cache_file in self.cache_dir.glob("*.json"):
-            cache_file.unlink()
-            count += 1
-        return count
+        with self._memory_lock:
+            self._memory_cache.clear()
+        return self._execute("DELETE FROM cache").rowcount
     
     def get_cache_info(self, symbol: Optional[str] = None) -> Dict[str, Any]:
         """Get cache information"""
@@ -184,40 +271,20 @@ class CacheManager:
             'entries_by_symbol': {}
         }
         
-        total_size = 0
+        where, params = ("WHERE symbol = ?", (symbol.upper(),)) if symbol else ("", ())
+        now = time.time()
         
-        for cache_file in self.cache_dir.glob("*.json"):
-            try:
-                file_size = cache_file.stat().st_size
-                total_size += file_size
-                
-                with open(cache_file, 'r') as f:
-                    data = json.load(f)
-                
-                entry = CacheEntry.from_dict(data)
-                
-                # Filter by symbol if specified
-                if symbol and entry.symbol.upper() != symbol.upper():
-                    continue
-                
-                info['total_entries'] += 1
-                
-                if entry.is_expired:
-                    info['expired_entries'] += 1
-                
-                # Count by data type
-                if entry.data_type not in info['entries_by_type']:
-                    info['entries_by_type'][entry.data_type] = 0
-                info['entries_by_type'][entry.data_type] += 1
-                
-                # Count by symbol
-                if entry.symbol not in info['entries_by_symbol']:
-                    info['entries_by_symbol'][entry.symbol] = 0
-                info['entries_by_symbol'][entry.symbol] += 1
-                
-            except Exception:
-                continue
+        # One pass over the metadata index, tallied by type and symbol
+        for entry_symbol, data_type, count, expired in self._execute(
+            f"SELECT symbol, data_type, COUNT(*), SUM(expires_at < ?) FROM cache {where} "
+            "GROUP BY symbol, data_type", (now,) + params
+        ).fetchall():
+            info['total_entries'] += count
+            info['expired_entries'] += expired
+            info['entries_by_type'][data_type] = info['entries_by_type'].get(data_type, 0) + count
+            info['entries_by_symbol'][entry_symbol] = info['entries_by_symbol'].get(entry_symbol, 0) + count
         
+        total_size = self._execute("SELECT COALESCE(SUM(LENGTH(blob)), 0) FROM cache").fetchone()[0]
         info['cache_size_mb'] = round(total_size / (1024 * 1024), 2)
         return info
     
@@ -225,24 +292,25 @@ class CacheManager:
         """Get cache status for a specific symbol"""
         status = {}
         
-        for data_type in self.cache_durations.keys():
-            cache_key = self._get_cache_key(symbol, data_type)
-            cache_file = self._get_cache_file(cache_key)
-            
-            if cache_file.exists():
-                try:
-                    with open(cache_file, 'r') as f:
-                        data = json.load(f)
-                    
-                    entry = CacheEntry.from_dict(data)
-                    status[data_type] = {
-                        'cached': True,
-                        'expired': entry.is_expired,
-                        'age_minutes': round(entry.age_minutes, 1),
-                        'expires_in_minutes': round((entry.expires_at - time.time()) / 60, 1)
-                    }
-                except Exception:
-                    status[data_type] = {'cached': False, 'error': True}
+        cache_keys = {self._get_cache_key(symbol, data_type): data_type
+                      for data_type in self.cache_durations.keys()}
+        placeholders = ", ".join("?" * len(cache_keys))
+        rows = self._execute(
+            f"SELECT key, timestamp, expires_at FROM cache WHERE key IN ({placeholders})",
+            tuple(cache_keys)
+        ).fetchall()
+        found = {key: (timestamp, expires_at) for key, timestamp, expires_at in rows}
+        
+        now = time.time()
+        for cache_key, data_type in cache_keys.items():
+            if cache_key in found:
+                timestamp, expires_at = found[cache_key]
+                status[data_type] = {
+                    'cached': True,
+                    'expired': now > expires_at,
+                    'age_minutes': round((now - timestamp) / 60, 1),
+                    'expires_in_minutes': round((expires_at - now) / 60, 1)
+                }
             else:
                 status[data_type] = {'cached': False}
         
@@ -7,8 +7,81 @@ from rich.text import Text
 from rich.panel import Panel
 from typing import List, Tuple, Optional
 import pandas as pd
+import numpy as np
 from datetime import datetime
 import math
+from itertools import groupby
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+# Selectable chart periods, in key-binding order
+CHART_PERIODS = [
+    ("1d", "1 Day"),
+    ("5d", "5 Days"),
+    ("1mo", "1 Month"),
+    ("3mo", "3 Months"),
+    ("6mo", "6 Months"),
+    ("1y", "1 Year"),
+    ("2y", "2 Years")
+]
+PERIOD_LABELS = dict(CHART_PERIODS)
+
+# (color, sign prefix) for the price change, indexed by "is up"
+CHANGE_STYLES = (("red", ""), ("green", "+"))
+
+# Glyph codes produced by the rasterizer
+GLYPH_SPACE, GLYPH_DOT, GLYPH_VBAR = 0, 1, 2
+GLYPH_CHARS = np.array([' ', '•', '│'], dtype='<U1')
+
+
+def _rasterize_numpy(prices: np.ndarray, min_price: float, price_range: float, height: int) -> np.ndarray:
+    """Rasterize sampled prices into a (height, width) glyph-code matrix"""
+    width = len(prices)
+    
+    # Row index of each column's price level (row 0 is the top of the chart)
+    levels = ((prices - min_price) / price_range * (height - 1)).astype(np.int32)
+    rows = height - 1 - levels
+    
+    # Connect adjacent points with a vertical run in the later column
+    y = np.arange(height)[:, None]
+    span_top = np.minimum(rows[:-1], rows[1:])
+    span_bottom = np.maximum(rows[:-1], rows[1:])
+    connector = np.where(np.abs(rows[1:] - rows[:-1]) > 1, GLYPH_VBAR, GLYPH_DOT).astype(np.uint8)
+    
+    glyphs = np.zeros((height, width), dtype=np.uint8)
+    glyphs[:, 1:] = np.where((y >= span_top) & (y <= span_bottom), connector, GLYPH_SPACE)
+    
+    # Plot the points themselves on top of the connectors
+    glyphs[rows, np.arange(width)] = GLYPH_DOT
+    return glyphs
+
+
+def _rasterize_fused(prices: np.ndarray, min_price: float, price_range: float, height: int) -> np.ndarray:
+    """Single-pass rasterizer: normalize, connect and plot each column in one loop"""
+    width = prices.shape[0]
+    glyphs = np.zeros((height, width), dtype=np.uint8)
+    prev_row = 0
+    for i in range(width):
+        row = height - 1 - int((prices[i] - min_price) / price_range * (height - 1))
+        if i > 0:
+            code = GLYPH_VBAR if abs(row - prev_row) > 1 else GLYPH_DOT
+            for y in range(min(prev_row, row), max(prev_row, row) + 1):
+                glyphs[y, i] = code
+        glyphs[row, i] = GLYPH_DOT
+        prev_row = row
+    return glyphs
+
+
+# The fused loop only pays off when compiled; otherwise use the NumPy version
+if njit is not None:
+    _rasterize = njit(cache=True)(_rasterize_fused)
+    _rasterize(np.linspace(0.0, 1.0, 4), 0.0, 1.0, 20)  # Warm the JIT so the first render isn't cold
+else:
+    _rasterize = _rasterize_numpy
 
 
 class StockChart(Static):
@@ -54,16 +127,7 @@ class StockChart(Static):
     
     def get_period_label(self) -> str:
         """Get human-readable period label"""
-        period_labels = {
-            "1d": "1 Day",
-            "5d": "5 Days", 
-            "1mo": "1 Month",
-            "3mo": "3 Months",
-            "6mo": "6 Months",
-            "1y": "1 Year",
-            "2y": "2 Years"
-        }
-        return period_labels.get(self.period, self.period)
+        return PERIOD_LABELS.get(self.period, self.period)
     
     def is_price_up(self) -> bool:
         """Check if price is up from first to last"""
@@ -76,53 +140,27 @@ class StockChart(Static):
         if self.data is None or len(self.data) < 2:
             return Text("Insufficient data for chart")
         
-        prices = self.data['Close'].tolist()
-        dates = self.data['Date'].tolist()
+        prices = self.data['Close'].to_numpy(dtype=np.float64, copy=False)
+        dates = self.data['Date']
         
         # Normalize prices to chart height
-        min_price = min(prices)
-        max_price = max(prices)
+        min_price = prices.min()
+        max_price = prices.max()
         price_range = max_price - min_price
         
         if price_range == 0:
             return Text("Price unchanged - no chart to display")
         
-        # Create the chart grid
-        chart_lines = []
         height = self.chart_height
         width = min(self.chart_width, len(prices))
         
-        # Sample data points if we have more data than width
+        # Sample data points if we have more data than width (strided view, no copy)
+        step = 1
         if len(prices) > width:
             step = len(prices) // width
             prices = prices[::step][:width]
-            dates = dates[::step][:width]
         
-        # Calculate price levels for each column
-        normalized_prices = []
-        for price in prices:
-            level = int(((price - min_price) / price_range) * (height - 1))
-            normalized_prices.append(level)
-        
-        # Create the chart matrix
-        chart_matrix = [[' ' for _ in range(width)] for _ in range(height)]
-        
-        # Plot the line chart
-        for i, level in enumerate(normalized_prices):
-            chart_matrix[height - 1 - level][i] = '•'
-            
-            # Connect points with lines
-            if i > 0:
-                prev_level = normalized_prices[i-1]
-                start_y = height - 1 - prev_level
-                end_y = height - 1 - level
-                
-                # Draw vertical line between points
-                min_y = min(start_y, end_y)
-                max_y = max(start_y, end_y)
-                for y in range(min_y, max_y + 1):
-                    if chart_matrix[y][i] == ' ':
-                        chart_matrix[y][i] = '│' if abs(start_y - end_y) > 1 else '•'
+        chart_matrix = GLYPH_CHARS[_rasterize(prices, min_price, price_range, height)]
         
         # Add price labels on the right
         price_labels = []
@@ -139,13 +177,14 @@ class StockChart(Static):
         change = last_price - first_price
         change_pct = (change / first_price) * 100
         
-        color = "green" if change >= 0 else "red"
-        change_symbol = "+" if change >= 0 else ""
+        color, change_symbol = CHANGE_STYLES[bool(change >= 0)]
         
         title_text = f"Price: ${last_price:.2f} ({change_symbol}{change:.2f}, {change_pct:+.1f}%)\n"
         text.append(title_text, style=f"bold {color}")
         text.append("\n")
         
+        glyph_styles = {'•': f"bold {color}", '│': color, ' ': None}
+        
         # Add price scale on the left
         label_idx = 0
         for i, row in enumerate(chart_matrix):
@@ -156,22 +195,20 @@ class StockChart(Static):
             else:
                 text.append("         ", style="dim")
             
-            # Add chart data
-            for j, char in enumerate(row):
-                if char == '•':
-                    text.append(char, style=f"bold {color}")
-                elif char == '│':
-                    text.append(char, style=color)
-                else:
-                    text.append(char)
+            # Add chart data, one span per run of identical glyphs
+            for glyph, run in groupby(row):
+                text.append(glyph * sum(1 for _ in run), style=glyph_styles[glyph])
             text.append("\n")
         
         # Add time axis
         text.append("         ")  # Padding for price labels
-        for i in range(0, width, max(1, width // 5)):
-            if i < len(dates):
-                date_str = dates[i].strftime("%m/%d") if hasattr(dates[i], 'strftime') else str(dates[i])[:5]
-                text.append(f"{date_str:<12}", style="dim")
+        tick_dates = dates.iloc[np.arange(0, width, max(1, width // 5)) * step]
+        if pd.api.types.is_datetime64_any_dtype(tick_dates):
+            date_labels = tick_dates.dt.strftime("%m/%d")
+        else:
+            date_labels = tick_dates.astype(str).str[:5]
+        for date_str in date_labels:
+            text.append(f"{date_str:<12}", style="dim")
         
         return text
 
@@ -182,37 +219,35 @@ class ChartControls(Static):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.current_period = "1mo"
+        # Only the highlighted period differs between states, so build each panel once
+        self._panels = {period_key: self._build_panel(period_key) for period_key, _ in CHART_PERIODS}
         
     def on_mount(self):
         """Initialize the controls display"""
         self.update_display()
-        
-    def update_display(self):
-        """Update the controls display"""
+    
+    @staticmethod
+    def _build_panel(active_period: str) -> Panel:
+        """Build the controls panel with the given period highlighted"""
         controls_text = Text()
-        
-        periods = [
-            ("1d", "1 Day"),
-            ("5d", "5 Days"), 
-            ("1mo", "1 Month"),
-            ("3mo", "3 Months"),
-            ("6mo", "6 Months"),
-            ("1y", "1 Year"),
-            ("2y", "2 Years")
-        ]
-        
         controls_text.append("Time Period: ", style="bold")
         
-        for i, (period_key, period_label) in enumerate(periods):
-            style = "bold green" if period_key == self.current_period else "dim"
+        for i, (period_key, period_label) in enumerate(CHART_PERIODS):
+            style = "bold green" if period_key == active_period else "dim"
             controls_text.append(f"[{i+1}] {period_label}  ", style=style)
         
         controls_text.append("\nPress 1-7 to change time period")
         
-        panel = Panel(controls_text, title="Chart Controls", border_style="blue")
+        return Panel(controls_text, title="Chart Controls", border_style="blue")
+        
+    def update_display(self):
+        """Update the controls display"""
+        panel = self._panels.get(self.current_period)
+        if panel is None:
+            panel = self._build_panel(self.current_period)
         self.update(panel)
         
     def update_period(self, period: str):
         """Update current period and refresh display"""
         self.current_period = period
-        self.update_display()
\ No newline at end of file
+        self.update_display()
@@ -2,18 +2,356 @@
 Comprehensive Financial Analysis Engine - Advanced Features
 Extends the base financial analyzer with sophisticated analysis capabilities
 """
-import yfinance as yf
 import pandas as pd
 import numpy as np
-import requests
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Tuple, Any
 import math
+import operator
+import time
+from functools import lru_cache
 from collections import defaultdict
+from types import MappingProxyType
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 
+from config import config_manager
+from finance_core import FinancialAnalyzer
 
-@dataclass
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+try:
+    from math import sumprod
+except ImportError:  # Python < 3.12
+    def sumprod(p, q):
+        return sum(map(operator.mul, p, q))
+
+# Upper bound on how long the parallel sub-analyses may take in total
+ANALYSIS_TIMEOUT = 30
+
+# Errors raised by missing or malformed yfinance fields
+DATA_ERRORS = (KeyError, TypeError, ValueError, AttributeError, ArithmeticError)
+
+
+def _analysis_cache_name(symbol: str) -> str:
+    """Name of a symbol's comprehensive analysis in the shared day-keyed pickle cache"""
+    return f"{symbol}_comprehensive"
+
+
+def _rsi_last_loop(prices: np.ndarray, period: int) -> float:
+    """Final Wilder-smoothed RSI value in a single pass over prices"""
+    avg_gain = 0.0
+    avg_loss = 0.0
+    for i in range(1, period + 1):
+        change = prices[i] - prices[i - 1]
+        if change > 0:
+            avg_gain += change
+        else:
+            avg_loss -= change
+    avg_gain /= period
+    avg_loss /= period
+    
+    for i in range(period + 1, prices.shape[0]):
+        change = prices[i] - prices[i - 1]
+        gain = change if change > 0 else 0.0
+        loss = -change if change < 0 else 0.0
+        avg_gain = (avg_gain * (period - 1) + gain) / period
+        avg_loss = (avg_loss * (period - 1) + loss) / period
+    
+    if avg_loss == 0.0:
+        return 100.0
+    return 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+
+def _rsi_last_numpy(prices: np.ndarray, period: int) -> float:
+    """Final Wilder-smoothed RSI value using the closed form of the smoothing recursion"""
+    delta = np.diff(prices)
+    gains = np.clip(delta, 0.0, None)
+    losses = np.clip(-delta, 0.0, None)
+    
+    # Seed with the simple average, then decay it and weight later moves geometrically
+    steps = len(delta) - period
+    keep = 1.0 - 1.0 / period
+    weights = keep ** np.arange(steps - 1, -1, -1) / period
+    avg_gain = gains[:period].mean() * keep ** steps + weights @ gains[period:]
+    avg_loss = losses[:period].mean() * keep ** steps + weights @ losses[period:]
+    
+    if avg_loss == 0.0:
+        return 100.0
+    return float(100.0 - 100.0 / (1.0 + avg_gain / avg_loss))
+
+
+# The loop only pays off when compiled; otherwise use the NumPy version
+if njit is not None:
+    _rsi_last = njit(cache=True)(_rsi_last_loop)
+else:
+    _rsi_last = _rsi_last_numpy
+
+
+def _risk_stats_loop(returns: np.ndarray) -> Tuple[float, float, float, float, float, float]:
+    """Mean, std, downside std, max drawdown and 30/90-day std of daily returns in one pass"""
+    n = returns.shape[0]
+    total = 0.0
+    total_sq = 0.0
+    neg_count = 0
+    neg_total = 0.0
+    neg_sq = 0.0
+    tail30 = 0.0
+    tail30_sq = 0.0
+    tail90 = 0.0
+    tail90_sq = 0.0
+    cumulative = 1.0
+    peak = -np.inf
+    max_drawdown = 0.0
+    
+    for i in range(n):
+        r = returns[i]
+        total += r
+        total_sq += r * r
+        if r < 0:
+            neg_count += 1
+            neg_total += r
+            neg_sq += r * r
+        if i >= n - 30:
+            tail30 += r
+            tail30_sq += r * r
+        if i >= n - 90:
+            tail90 += r
+            tail90_sq += r * r
+        
+        cumulative *= 1.0 + r
+        if cumulative > peak:
+            peak = cumulative
+        drawdown = (cumulative - peak) / peak
+        if drawdown < max_drawdown:
+            max_drawdown = drawdown
+    
+    # Sample (ddof=1) standard deviations from the running sums
+    mean = total / n
+    std = math.sqrt(max((total_sq - total * mean) / (n - 1), 0.0))
+    if neg_count == 0:
+        downside_std = 0.0
+    elif neg_count == 1:
+        downside_std = np.nan
+    else:
+        downside_std = math.sqrt(max((neg_sq - neg_total * neg_total / neg_count) / (neg_count - 1), 0.0))
+    m30 = min(n, 30)
+    m90 = min(n, 90)
+    std_30 = math.sqrt(max((tail30_sq - tail30 * tail30 / m30) / (m30 - 1), 0.0))
+    std_90 = math.sqrt(max((tail90_sq - tail90 * tail90 / m90) / (m90 - 1), 0.0))
+    return mean, std, downside_std, max_drawdown, std_30, std_90
+
+
+def _risk_stats_numpy(returns: np.ndarray) -> Tuple[float, float, float, float, float, float]:
+    """NumPy equivalent of _risk_stats_loop"""
+    negative = returns[returns < 0]
+    if negative.size == 0:
+        downside_std = 0.0
+    elif negative.size == 1:
+        downside_std = np.nan
+    else:
+        downside_std = negative.std(ddof=1)
+    
+    cumulative = np.cumprod(1.0 + returns)
+    running_max = np.maximum.accumulate(cumulative)
+    max_drawdown = ((cumulative - running_max) / running_max).min()
+    
+    return (returns.mean(), returns.std(ddof=1), downside_std, max_drawdown,
+            returns[-30:].std(ddof=1), returns[-90:].std(ddof=1))
+
+
+if njit is not None:
+    _risk_stats = njit(cache=True)(_risk_stats_loop)
+else:
+    _risk_stats = _risk_stats_numpy
+
+
+# Simple 2-stage DCF assumptions: stage-1 growth for DCF_YEARS, then terminal growth
+DCF_YEARS = 5
+DCF_DISCOUNT_RATE = 0.10  # 10% WACC assumption
+DCF_TERMINAL_GROWTH = 0.03
+
+
+def _dcf_present_value_py(fcf: float, growth_rate: float, discount_rate: float,
+                          terminal_growth: float, years: int) -> float:
+    """Present value of `years` of growing cash flows plus a Gordon terminal value"""
+    ratio = (1.0 + growth_rate) / (1.0 + discount_rate)
+    
+    # Geometric series sum of the discounted stage-1 cash flows
+    if growth_rate != discount_rate:
+        pv_sum = fcf * (1.0 + growth_rate) / (discount_rate - growth_rate) * (1.0 - ratio ** years)
+    else:
+        pv_sum = fcf * years
+    
+    terminal_pv = fcf * ratio ** years * (1.0 + terminal_growth) / (discount_rate - terminal_growth)
+    return pv_sum + terminal_pv
+
+
+if njit is not None:
+    _dcf_present_value = njit(cache=True)(_dcf_present_value_py)
+else:
+    _dcf_present_value = _dcf_present_value_py
+
+
+# Scoring kernels: plain floats in, float out, with NaN standing in for missing metrics
+
+def _clamp_score_py(score: float) -> float:
+    """Clamp a score into 0-100 with plain comparisons"""
+    if score < 0.0:
+        return 0.0
+    if score > 100.0:
+        return 100.0
+    return score
+
+
+_clamp_score = njit(cache=True)(_clamp_score_py) if njit is not None else _clamp_score_py
+
+
+def _health_score_py(piotroski: float, altman: float) -> float:
+    """Financial health score (0-100) from Piotroski and Altman"""
+    score = 50.0  # Base score
+    
+    if not math.isnan(piotroski):
+        # Piotroski score contributes 0-30 points
+        score += (piotroski / 9) * 30
+    
+    if not math.isnan(altman):
+        if altman > 3.0:
+            score += 20  # Safe zone
+        elif altman > 1.8:
+            score += 10  # Gray zone
+        else:
+            score -= 20  # Distress zone
+    
+    return _clamp_score(score)
+
+
+def _momentum_score_py(momentum_1m: float) -> float:
+    """Momentum score (0-100) from 1-month price momentum"""
+    score = 50.0
+    
+    if not math.isnan(momentum_1m):
+        if momentum_1m > 10:
+            score += 20
+        elif momentum_1m > 0:
+            score += 10
+        elif momentum_1m < -10:
+            score -= 20
+        else:
+            score -= 10
+    
+    return _clamp_score(score)
+
+
+def _risk_score_py(sharpe_ratio: float, max_drawdown: float) -> float:
+    """Risk score (0-100, higher is safer) from Sharpe ratio and max drawdown"""
+    score = 50.0
+    
+    if not math.isnan(sharpe_ratio):
+        if sharpe_ratio > 1.0:
+            score += 25
+        elif sharpe_ratio > 0.5:
+            score += 15
+        elif sharpe_ratio < 0:
+            score -= 20
+    
+    if not math.isnan(max_drawdown):
+        if max_drawdown > -10:
+            score += 15
+        elif max_drawdown > -20:
+            score += 5
+        elif max_drawdown < -40:
+            score -= 25
+    
+    return _clamp_score(score)
+
+
+def _valuation_score_py(dcf_estimate: float, current_price: float, price_to_fcf: float) -> float:
+    """Valuation score (0-100) from price vs DCF and price/FCF"""
+    score = 50.0
+    
+    if not math.isnan(dcf_estimate) and not math.isnan(current_price):
+        ratio = current_price / dcf_estimate
+        if ratio < 0.8:  # Trading below DCF
+            score += 25
+        elif ratio < 1.0:
+            score += 15
+        elif ratio > 1.5:
+            score -= 25
+        elif ratio > 1.2:
+            score -= 15
+    
+    if not math.isnan(price_to_fcf):
+        if price_to_fcf < 15:
+            score += 15
+        elif price_to_fcf > 30:
+            score -= 15
+    
+    return _clamp_score(score)
+
+
+def _quality_score_py(cf_to_earnings: float, red_flags: int) -> float:
+    """Quality score (0-100) from cash flow/earnings and red flag count"""
+    score = 70.0  # Start higher for quality
+    
+    if not math.isnan(cf_to_earnings):
+        if cf_to_earnings > 1.2:
+            score += 20
+        elif cf_to_earnings > 0.8:
+            score += 10
+        else:
+            score -= 20
+    
+    # Penalize for red flags
+    score -= red_flags * 10
+    
+    return _clamp_score(score)
+
+
+def _earnings_quality_py(cf_to_earnings: float, red_flags: int) -> float:
+    """Earnings quality score (0-100), NaN when cash flow/earnings is missing"""
+    if math.isnan(cf_to_earnings):
+        return np.nan
+    
+    quality = 80.0  # Start high
+    
+    if cf_to_earnings < 0.8:
+        quality -= 30
+    elif cf_to_earnings < 1.0:
+        quality -= 10
+    
+    quality -= red_flags * 15
+    
+    return _clamp_score(quality)
+
+
+if njit is not None:
+    _health_score = njit(cache=True)(_health_score_py)
+    _momentum_score = njit(cache=True)(_momentum_score_py)
+    _risk_score = njit(cache=True)(_risk_score_py)
+    _valuation_score = njit(cache=True)(_valuation_score_py)
+    _quality_score = njit(cache=True)(_quality_score_py)
+    _earnings_quality = njit(cache=True)(_earnings_quality_py)
+else:
+    _health_score = _health_score_py
+    _momentum_score = _momentum_score_py
+    _risk_score = _risk_score_py
+    _valuation_score = _valuation_score_py
+    _quality_score = _quality_score_py
+    _earnings_quality = _earnings_quality_py
+
+
+def _metric(value) -> float:
+    """Optional metric as a float for the scoring kernels (missing or zero -> NaN)"""
+    # Explicit None/zero tests rather than truthiness: one guard each for a tracing JIT, no __bool__ dispatch
+    if value is None or value == 0:
+        return math.nan
+    return float(value)
+
+@dataclass(slots=True)
 class OptionsMetrics:
     """Options analysis metrics"""
     implied_volatility: Optional[float] = None
@@ -27,7 +365,7 @@ class OptionsMetrics:
     score: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class SectorMetrics:
     """Sector and market context metrics"""
     sector: str = ""
@@ -41,7 +379,7 @@ class SectorMetrics:
     score: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class FinancialHealthMetrics:
     """Advanced financial health metrics"""
     piotroski_score: Optional[int] = None  # 0-9 score
@@ -54,7 +392,7 @@ class FinancialHealthMetrics:
     score: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class MomentumMetrics:
     """Momentum and growth analysis"""
     price_momentum_1m: Optional[float] = None
@@ -68,7 +406,7 @@ class MomentumMetrics:
     score: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class RiskMetrics:
     """Advanced risk assessment metrics"""
     beta: Optional[float] = None
@@ -82,7 +420,7 @@ class RiskMetrics:
     risk_score: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class ValuationMetrics:
     """Advanced valuation analysis"""
     dcf_estimate: Optional[float] = None
@@ -96,7 +434,7 @@ class ValuationMetrics:
     valuation_score: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class QualityMetrics:
     """Earnings and financial quality metrics"""
     earnings_quality: Optional[float] = None  # 0-100
@@ -104,12 +442,13 @@ class QualityMetrics:
     cash_flow_to_earnings: Optional[float] = None
     revenue_recognition_quality: Optional[float] = None
     accounting_red_flags: List[str] = field(default_factory=list)
+    red_flag_count: int = 0  # len(accounting_red_flags), stored for the scorers
     audit_quality: Optional[str] = None
     management_efficiency: Optional[float] = None
     score: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class MacroContextMetrics:
     """Macroeconomic context analysis"""
     interest_rate_sensitivity: Optional[float] = None
@@ -122,7 +461,7 @@ class MacroContextMetrics:
     score: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class ComprehensiveAnalysis:
     """Complete comprehensive analysis results"""
     symbol: str
@@ -141,10 +480,77 @@ class ComprehensiveAnalysis:
     warnings: List[str] = field(default_factory=list)
 
 
+# Sector lookups for the macro context
+_INTEREST_SENSITIVITY = MappingProxyType({
+    'Real Estate': 0.8,
+    'Utilities': 0.7,
+    'Financial Services': 0.6,
+    'Consumer Cyclical': 0.4,
+    'Technology': 0.2,
+    'Healthcare': 0.1,
+    'Consumer Defensive': 0.1
+})
+
+_INFLATION_IMPACT = MappingProxyType({
+    'Energy': 'Positive',
+    'Materials': 'Positive',
+    'Real Estate': 'Mixed',
+    'Financial Services': 'Mixed',
+    'Consumer Defensive': 'Negative',
+    'Technology': 'Negative',
+    'Healthcare': 'Negative'
+})
+
+# Component scores feeding the composite, in projection order
+SCORE_COMPONENTS = ('financial_health', 'valuation', 'quality', 'momentum', 'risk')
+
+# Optional metrics read by confidence, insights and warnings, in projection order
+SIGNAL_FIELDS = ('piotroski', 'altman', 'dcf', 'cf_to_earnings', 'max_drawdown', 'red_flags')
+
+_RULE_OPS = {'>': 0, '>=': 1, '<': 2, '<=': 3}
+
+# (field, comparison, threshold, message) - messages may reference any signal field
+INSIGHT_RULES = [
+    ('piotroski', '>=', 7, "Strong financial health (Piotroski score: {piotroski}/9)"),
+    ('piotroski', '<=', 3, "Weak financial health (Piotroski score: {piotroski}/9)"),
+    # DCF thresholds are relative to a placeholder price of 100
+    ('dcf', '>', 120, "Trading below estimated intrinsic value"),
+    ('dcf', '<', 80, "Trading above estimated intrinsic value"),
+    ('cf_to_earnings', '>', 1.2, "Strong cash flow generation relative to earnings"),
+    ('max_drawdown', '>', -10, "Low historical volatility and drawdown"),
+    ('max_drawdown', '<', -30, "High historical volatility with significant drawdowns"),
+]
+
+WARNING_RULES = [
+    ('altman', '<', 1.8, "⚠️ Elevated bankruptcy risk (low Altman Z-score)"),
+    ('red_flags', '>', 0, "⚠️ {red_flags} accounting red flags detected"),
+    ('max_drawdown', '<', -40, "⚠️ Very high historical volatility and drawdowns"),
+]
+
+
+def _compile_rules(rules: List[tuple]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, List[str]]:
+    """Split a rule table into field-index, op-code and threshold arrays plus messages"""
+    fields = np.array([SIGNAL_FIELDS.index(field) for field, _, _, _ in rules])
+    ops = np.array([_RULE_OPS[op] for _, op, _, _ in rules])
+    thresholds = np.array([threshold for _, _, threshold, _ in rules], dtype=np.float64)
+    return fields, ops, thresholds, [message for _, _, _, message in rules]
+
+
+_CONFIDENCE_FIELDS = np.array([SIGNAL_FIELDS.index(field) for field in ('piotroski', 'altman', 'cf_to_earnings')])
+_CONFIDENCE_BITS = 1 << np.arange(len(_CONFIDENCE_FIELDS))
+# Confidence for every data-presence bitmask: each available key metric adds 0.1 to the 0.7 base
+_CONFIDENCE_BY_MASK = np.array([min(0.95, 0.7 + 0.1 * mask.bit_count())
+                                for mask in range(1 << len(_CONFIDENCE_FIELDS))])
+_INSIGHT_TABLE = _compile_rules(INSIGHT_RULES)
+_WARNING_TABLE = _compile_rules(WARNING_RULES)
+
+
 class ComprehensiveAnalyzer:
     """Advanced comprehensive financial analyzer"""
     
-    def __init__(self):
+    def __init__(self, market_data: Optional[FinancialAnalyzer] = None):
+        # Market data is read through a FinancialAnalyzer's caches; pass the app's own to share them
+        self.market_data = market_data or FinancialAnalyzer()
         self.risk_free_rate = 0.045  # Current 10Y Treasury rate (approximate)
         
         # Scoring weights for composite score
@@ -157,83 +563,265 @@ class ComprehensiveAnalyzer:
             'momentum': 0.10,
             'risk': 0.05
         }
+        self._composite_w = tuple(self.composite_weights.get(component, 0.1) for component in SCORE_COMPONENTS)
+        self._score_weights = np.array(self._composite_w)
     
     def perform_comprehensive_analysis(self, symbol: str) -> ComprehensiveAnalysis:
         """Perform complete comprehensive analysis"""
-        print(f"🔍 Starting comprehensive analysis for {symbol}...")
+        cached = config_manager.load_pickle(_analysis_cache_name(symbol))
+        if cached is not None:
+            return cached
         
-        # Get ticker object
-        ticker = yf.Ticker(symbol)
+        print(f"🔍 Starting comprehensive analysis for {symbol}...")
         
         try:
-            # Perform all analysis components
-            options_metrics = self._analyze_options(ticker, symbol)
-            sector_metrics = self._analyze_sector_context(ticker, symbol)
-            financial_health = self._analyze_financial_health(ticker, symbol)
-            momentum_metrics = self._analyze_momentum(ticker, symbol)
-            risk_metrics = self._analyze_risk(ticker, symbol)
-            valuation_metrics = self._analyze_valuation(ticker, symbol)
-            quality_metrics = self._analyze_quality(ticker, symbol)
-            macro_context = self._analyze_macro_context(ticker, symbol)
-            
-            # Calculate composite score and insights
-            composite_score = self._calculate_composite_score(
-                financial_health, valuation_metrics, quality_metrics,
-                momentum_metrics, risk_metrics
-            )
-            
-            confidence_level = self._calculate_confidence(
-                options_metrics, financial_health, quality_metrics
-            )
-            
-            key_insights = self._generate_key_insights(
-                symbol, financial_health, valuation_metrics, quality_metrics,
-                momentum_metrics, risk_metrics
-            )
-            
-            warnings = self._generate_warnings(
-                financial_health, quality_metrics, risk_metrics
-            )
-            
-            return ComprehensiveAnalysis(
-                symbol=symbol,
-                analysis_timestamp=datetime.now(),
-                options_metrics=options_metrics,
-                sector_metrics=sector_metrics,
-                financial_health=financial_health,
-                momentum_metrics=momentum_metrics,
-                risk_metrics=risk_metrics,
-                valuation_metrics=valuation_metrics,
-                quality_metrics=quality_metrics,
-                macro_context=macro_context,
-                composite_score=composite_score,
-                confidence_level=confidence_level,
-                key_insights=key_insights,
-                warnings=warnings
+            results = self._analyze_components(symbol)
+            
+            # Project the metrics once, then derive composite score and insights
+            scores = self._component_scores(results)
+            signals = self._signals(results)
+            signal_values = self._signal_values(signals)
+            
+            analysis = self._assemble_analysis(
+                symbol, results,
+                composite_score=self._calculate_composite_score(scores),
+                confidence_level=self._calculate_confidence(signal_values),
+                key_insights=self._generate_key_insights(signal_values, signals),
+                warnings=self._generate_warnings(signal_values, signals)
             )
+            # Timed-out components fell back to empty metrics; don't pin those for the day
+            if not results['timed_out']:
+                config_manager.store_pickle(_analysis_cache_name(symbol), analysis)
+            return analysis
             
         except Exception as e:
-            print(f"❌ Error in comprehensive analysis for {symbol}: {e}")
-            # Return minimal analysis with error info
-            return ComprehensiveAnalysis(
-                symbol=symbol,
-                analysis_timestamp=datetime.now(),
-                options_metrics=OptionsMetrics(),
-                sector_metrics=SectorMetrics(),
-                financial_health=FinancialHealthMetrics(),
-                momentum_metrics=MomentumMetrics(),
-                risk_metrics=RiskMetrics(),
-                valuation_metrics=ValuationMetrics(),
-                quality_metrics=QualityMetrics(),
-                macro_context=MacroContextMetrics(),
-                warnings=[f"Analysis error: {str(e)}"]
-            )
+            return self._failed_analysis(symbol, e)
+    
+    def analyze_many(self, symbols: List[str]) -> Dict[str, ComprehensiveAnalysis]:
+        """Run comprehensive analysis for several symbols, batching the download and the scoring"""
+        symbols = list(dict.fromkeys(symbols))
+        if not symbols:
+            return {}
+        
+        # Serve today's cached analyses; only the rest are downloaded and analyzed
+        analyses = {}
+        for symbol in symbols:
+            cached = config_manager.load_pickle(_analysis_cache_name(symbol))
+            if cached is not None:
+                analyses[symbol] = cached
+        pending = [symbol for symbol in symbols if symbol not in analyses]
+        if not pending:
+            return analyses
+        
+        # One batched request for every symbol's 2y history plus the SPY benchmark
+        self.market_data.prefetch_history(pending + ["SPY"], "2y")
+        
+        def collect(symbol: str):
+            print(f"🔍 Starting comprehensive analysis for {symbol}...")
+            try:
+                return self._analyze_components(symbol)
+            except Exception as e:
+                return e
+        
+        with ThreadPoolExecutor(max_workers=min(8, len(pending)), thread_name_prefix="analyze-many") as executor:
+            collected = dict(zip(pending, executor.map(collect, pending)))
+        
+        analyses.update(
+            (symbol, self._failed_analysis(symbol, results))
+            for symbol, results in collected.items() if isinstance(results, Exception)
+        )
+        completed = {
+            symbol: results
+            for symbol, results in collected.items() if not isinstance(results, Exception)
+        }
+        
+        if completed:
+            # Score the whole panel at once: one row per symbol
+            signals = [self._signals(results) for results in completed.values()]
+            matrix = np.array([self._component_scores(results) for results in completed.values()], dtype=np.float64)
+            signal_matrix = np.vstack([self._signal_values(row) for row in signals])
+            
+            composites = self._composite_scores(matrix)
+            confidences = self._confidence_levels(signal_matrix)
+            insight_hits = self._rule_hits(_INSIGHT_TABLE, signal_matrix)
+            warning_hits = self._rule_hits(_WARNING_TABLE, signal_matrix)
+            
+            for row, (symbol, results) in enumerate(completed.items()):
+                analyses[symbol] = self._assemble_analysis(
+                    symbol, results,
+                    composite_score=float(composites[row]),
+                    confidence_level=float(confidences[row]),
+                    key_insights=self._format_rules(_INSIGHT_TABLE, insight_hits[row], signals[row])[:5],
+                    warnings=self._format_rules(_WARNING_TABLE, warning_hits[row], signals[row])
+                )
+                if not results['timed_out']:
+                    config_manager.store_pickle(_analysis_cache_name(symbol), analyses[symbol])
+        
+        return {symbol: analyses[symbol] for symbol in symbols}
+    
+    def score_panel(self, analyses: Dict[str, ComprehensiveAnalysis]) -> pd.DataFrame:
+        """Tabulate component scores for many symbols and recompute composites in one pass"""
+        symbols = list(analyses)
+        matrix = np.array([
+            [a.financial_health.score, a.valuation_metrics.valuation_score, a.quality_metrics.score,
+             a.momentum_metrics.score, a.risk_metrics.risk_score]
+            for a in analyses.values()
+        ], dtype=np.float64).reshape(len(symbols), len(SCORE_COMPONENTS))
+        
+        panel = pd.DataFrame(matrix, index=symbols, columns=list(SCORE_COMPONENTS))
+        panel['composite'] = self._composite_scores(matrix)
+        return panel
+    
+    def _analyze_components(self, symbol: str) -> Dict[str, Any]:
+        """Fetch a symbol's data once and run the eight sub-analyses against it"""
+        market_data = self.market_data
+        ticker = market_data.get_ticker(symbol)
+        
+        # Fetch shared data once; the sub-analyses only read from it
+        info = self._safe_fetch(lambda: market_data.get_info(symbol), {})
+        financials = self._safe_fetch(lambda: market_data.get_statement(symbol), pd.DataFrame())
+        balance_sheet = self._safe_fetch(lambda: market_data.get_statement(symbol, 'balance_sheet'), pd.DataFrame())
+        cash_flow = self._safe_fetch(lambda: market_data.get_statement(symbol, 'cashflow'), pd.DataFrame())
+        hist_2y = self._safe_fetch(lambda: market_data.get_history(symbol, "2y"), pd.DataFrame())
+        hist_1y = self._last_year(hist_2y)
+        
+        # Most recent period of each statement, as plain dicts
+        fin_latest = self._latest_column(financials)
+        bs_latest = self._latest_column(balance_sheet)
+        cf_latest = self._latest_column(cash_flow)
+        
+        # Perform all analysis components concurrently
+        components = {
+            'options': (self._analyze_options, (ticker, symbol), OptionsMetrics),
+            'sector': (self._analyze_sector_context, (info, hist_1y, symbol), SectorMetrics),
+            'health': (self._analyze_financial_health, (info, fin_latest, bs_latest, cf_latest, symbol), FinancialHealthMetrics),
+            'momentum': (self._analyze_momentum, (hist_1y, symbol), MomentumMetrics),
+            'risk': (self._analyze_risk, (info, hist_2y, symbol), RiskMetrics),
+            'valuation': (self._analyze_valuation, (info, symbol), ValuationMetrics),
+            'quality': (self._analyze_quality, (info, fin_latest, cf_latest, symbol), QualityMetrics),
+            'macro': (self._analyze_macro_context, (info, symbol), MacroContextMetrics),
+        }
+        return self._run_components(components, symbol)
+    
+    def _component_scores(self, results: Dict[str, Any]) -> Tuple[float, ...]:
+        """Component scores in SCORE_COMPONENTS order"""
+        return (
+            results['health'].score, results['valuation'].valuation_score,
+            results['quality'].score, results['momentum'].score, results['risk'].risk_score
+        )
+    
+    def _signals(self, results: Dict[str, Any]) -> Dict[str, Any]:
+        """Optional metrics read by confidence, insights and warnings"""
+        return {
+            'piotroski': results['health'].piotroski_score,
+            'altman': results['health'].altman_z_score,
+            'dcf': results['valuation'].dcf_estimate,
+            'cf_to_earnings': results['quality'].cash_flow_to_earnings,
+            'max_drawdown': results['risk'].max_drawdown,
+            'red_flags': results['quality'].red_flag_count
+        }
+    
+    def _signal_values(self, signals: Dict[str, Any]) -> np.ndarray:
+        """Signals as a float array in SIGNAL_FIELDS order"""
+        # Missing (or zero) metrics become NaN so every comparison on them is False
+        return np.array([signals[name] or np.nan for name in SIGNAL_FIELDS], dtype=np.float64)
+    
+    def _assemble_analysis(self, symbol: str, results: Dict[str, Any], **scoring) -> ComprehensiveAnalysis:
+        """Wrap sub-analysis results and their derived scores into a ComprehensiveAnalysis"""
+        return ComprehensiveAnalysis(
+            symbol=symbol,
+            analysis_timestamp=datetime.now(),
+            options_metrics=results['options'],
+            sector_metrics=results['sector'],
+            financial_health=results['health'],
+            momentum_metrics=results['momentum'],
+            risk_metrics=results['risk'],
+            valuation_metrics=results['valuation'],
+            quality_metrics=results['quality'],
+            macro_context=results['macro'],
+            **scoring
+        )
+    
+    def _failed_analysis(self, symbol: str, error: Exception) -> ComprehensiveAnalysis:
+        """Minimal analysis carrying the error as a warning"""
+        print(f"❌ Error in comprehensive analysis for {symbol}: {error}")
+        return ComprehensiveAnalysis(
+            symbol=symbol,
+            analysis_timestamp=datetime.now(),
+            options_metrics=OptionsMetrics(),
+            sector_metrics=SectorMetrics(),
+            financial_health=FinancialHealthMetrics(),
+            momentum_metrics=MomentumMetrics(),
+            risk_metrics=RiskMetrics(),
+            valuation_metrics=ValuationMetrics(),
+            quality_metrics=QualityMetrics(),
+            macro_context=MacroContextMetrics(),
+            warnings=[f"Analysis error: {str(error)}"]
+        )
+    
+    def _run_components(self, components: Dict[str, tuple], symbol: str) -> Dict[str, Any]:
+        """Run the sub-analyses on a thread pool; timed-out ones get empty metrics and are listed under 'timed_out'"""
+        executor = ThreadPoolExecutor(max_workers=len(components), thread_name_prefix="comprehensive")
+        try:
+            futures = {
+                name: executor.submit(func, *args)
+                for name, (func, args, _) in components.items()
+            }
+            deadline = time.monotonic() + ANALYSIS_TIMEOUT
+            
+            results = {'timed_out': []}
+            for name, future in futures.items():
+                try:
+                    results[name] = future.result(timeout=max(0, deadline - time.monotonic()))
+                except FutureTimeoutError:
+                    print(f"Warning: {name} analysis timed out for {symbol}")
+                    results[name] = components[name][2]()
+                    results['timed_out'].append(name)
+            return results
+        finally:
+            # Don't block on stragglers that already timed out
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _safe_fetch(self, fetch, default):
+        """Fetch a ticker attribute, returning a default if the request fails"""
+        try:
+            value = fetch()
+            return default if value is None else value
+        except Exception:
+            return default
+    
+    def _last_year(self, hist: pd.DataFrame) -> pd.DataFrame:
+        """Slice the trailing year out of a longer price history"""
+        if hist.empty:
+            return hist
+        return hist[hist.index > hist.index[-1] - pd.DateOffset(years=1)]
+    
+    def _align_values(self, left: pd.Series, right: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+        """Inner-join two date-indexed series into positionally aligned float64 arrays"""
+        # Join on exchange-local trading dates: Ticker.history returns tz-aware timestamps while
+        # batched yf.download frames are tz-naive, and the two never intersect as-is
+        left_dates = self._trading_dates(left.index)
+        right_dates = self._trading_dates(right.index)
+        common = left_dates.intersection(right_dates)
+        return (left.to_numpy(dtype=np.float64, na_value=np.nan)[left_dates.get_indexer(common)],
+                right.to_numpy(dtype=np.float64, na_value=np.nan)[right_dates.get_indexer(common)])
+    
+    def _trading_dates(self, index: pd.Index) -> pd.DatetimeIndex:
+        """Tz-naive midnight dates in each timestamp's own (exchange) timezone"""
+        index = pd.DatetimeIndex(index)
+        if index.tz is not None:
+            index = index.tz_localize(None)
+        return index.normalize()
+    
+    def _latest_column(self, statement: pd.DataFrame) -> Dict[str, Any]:
+        """Snapshot the most recent period of a financial statement into a dict"""
+        if statement.empty:
+            return {}
+        return statement.iloc[:, 0].to_dict()
     
     def _analyze_options(self, ticker, symbol: str) -> OptionsMetrics:
         """Analyze options data for insights"""
         try:
-            info = ticker.info
-            
             # Try to get options data
             options_data = {}
             try:
@@ -247,17 +835,21 @@ class ComprehensiveAnalyzer:
                     puts = option_chain.puts
                     
                     if not calls.empty and not puts.empty:
+                        # Missing volumes/IVs count as zero, matching pandas' skipna sums
+                        call_volumes = calls['volume'].to_numpy(dtype=np.float64, na_value=0.0)
+                        put_volumes = puts['volume'].to_numpy(dtype=np.float64, na_value=0.0)
+                        call_ivs = calls['impliedVolatility'].to_numpy(dtype=np.float64, na_value=0.0)
+                        put_ivs = puts['impliedVolatility'].to_numpy(dtype=np.float64, na_value=0.0)
+                        
                         # Calculate put/call ratio
-                        put_volume = puts['volume'].sum()
-                        call_volume = calls['volume'].sum()
+                        call_volume = call_volumes.sum()
+                        put_volume = put_volumes.sum()
                         put_call_ratio = put_volume / call_volume if call_volume > 0 else None
                         
-                        # Get implied volatility (weighted average)
-                        total_volume = calls['volume'].sum() + puts['volume'].sum()
+                        # Get implied volatility (volume-weighted average)
+                        total_volume = call_volume + put_volume
                         if total_volume > 0:
-                            call_iv_weighted = (calls['impliedVolatility'] * calls['volume']).sum()
-                            put_iv_weighted = (puts['impliedVolatility'] * puts['volume']).sum()
-                            implied_volatility = (call_iv_weighted + put_iv_weighted) / total_volume
+                            implied_volatility = (call_ivs @ call_volumes + put_ivs @ put_volumes) / total_volume
                         else:
                             implied_volatility = None
                         
@@ -266,7 +858,7 @@ class ComprehensiveAnalyzer:
                             'implied_volatility': implied_volatility,
                             'option_volume': int(total_volume)
                         }
-            except:
+            except Exception:
                 pass
             
             return OptionsMetrics(**options_data)
@@ -275,31 +867,26 @@ class ComprehensiveAnalyzer:
             print(f"Warning: Options analysis failed for {symbol}: {e}")
             return OptionsMetrics()
     
-    def _analyze_sector_context(self, ticker, symbol: str) -> SectorMetrics:
+    def _analyze_sector_context(self, info: dict, hist: pd.DataFrame, symbol: str) -> SectorMetrics:
         """Analyze sector and market context"""
         try:
-            info = ticker.info
-            
             sector = info.get('sector', '')
             industry = info.get('industry', '')
             
             # Get market correlation (simplified using SPY)
             try:
-                hist = ticker.history(period="1y")
-                spy = yf.Ticker("SPY").history(period="1y")
+                spy = self._last_year(self.market_data.get_history("SPY", "2y"))
                 
                 if not hist.empty and not spy.empty:
                     # Align dates and calculate correlation
-                    combined = pd.merge(hist[['Close']], spy[['Close']], 
-                                      left_index=True, right_index=True, 
-                                      suffixes=('_stock', '_spy'))
-                    if len(combined) > 30:
-                        correlation = combined['Close_stock'].corr(combined['Close_spy'])
+                    stock_close, spy_close = self._align_values(hist['Close'], spy['Close'])
+                    if len(stock_close) > 30:
+                        correlation = float(np.corrcoef(stock_close, spy_close)[0, 1])
                     else:
                         correlation = None
                 else:
                     correlation = None
-            except:
+            except Exception:
                 correlation = None
             
             return SectorMetrics(
@@ -312,30 +899,26 @@ class ComprehensiveAnalyzer:
             print(f"Warning: Sector analysis failed for {symbol}: {e}")
             return SectorMetrics()
     
-    def _analyze_financial_health(self, ticker, symbol: str) -> FinancialHealthMetrics:
+    def _analyze_financial_health(self, info: dict, fin_latest: dict, bs_latest: dict,
+                                  cf_latest: dict, symbol: str) -> FinancialHealthMetrics:
         """Calculate advanced financial health metrics"""
         try:
-            info = ticker.info
-            financials = ticker.financials
-            balance_sheet = ticker.balance_sheet
-            cash_flow = ticker.cashflow
-            
             # Calculate Piotroski F-Score
             piotroski_score = self._calculate_piotroski_score(
-                info, financials, balance_sheet, cash_flow
+                info, fin_latest, bs_latest, cf_latest
             )
             
             # Calculate Altman Z-Score
-            altman_z_score = self._calculate_altman_z_score(info, balance_sheet)
+            altman_z_score = self._calculate_altman_z_score(info, bs_latest)
             
             # Working capital
-            current_assets = balance_sheet.loc['Total Current Assets'].iloc[0] if 'Total Current Assets' in balance_sheet.index else None
-            current_liabilities = balance_sheet.loc['Total Current Liabilities'].iloc[0] if 'Total Current Liabilities' in balance_sheet.index else None
+            current_assets = bs_latest.get('Total Current Assets')
+            current_liabilities = bs_latest.get('Total Current Liabilities')
             working_capital = current_assets - current_liabilities if current_assets and current_liabilities else None
             
             # Debt coverage ratio
             total_debt = info.get('totalDebt')
-            operating_cash_flow = cash_flow.loc['Total Cash From Operating Activities'].iloc[0] if 'Total Cash From Operating Activities' in cash_flow.index else None
+            operating_cash_flow = cf_latest.get('Total Cash From Operating Activities')
             debt_coverage = operating_cash_flow / total_debt if total_debt and operating_cash_flow and total_debt > 0 else None
             
             health_metrics = FinancialHealthMetrics(
@@ -354,40 +937,24 @@ class ComprehensiveAnalyzer:
             print(f"Warning: Financial health analysis failed for {symbol}: {e}")
             return FinancialHealthMetrics()
     
-    def _analyze_momentum(self, ticker, symbol: str) -> MomentumMetrics:
+    def _analyze_momentum(self, hist: pd.DataFrame, symbol: str) -> MomentumMetrics:
         """Analyze momentum and growth trends"""
         try:
-            hist = ticker.history(period="1y")
-            
             if len(hist) < 30:
                 return MomentumMetrics()
             
-            current_price = hist['Close'].iloc[-1]
+            close = hist['Close'].to_numpy(dtype=np.float64, na_value=np.nan)
+            n = close.size
+            current_price = close[-1]
             
-            # Calculate momentum over different periods
-            if len(hist) >= 22:  # 1 month
-                price_1m_ago = hist['Close'].iloc[-22]
-                momentum_1m = (current_price - price_1m_ago) / price_1m_ago * 100
-            else:
-                momentum_1m = None
-                
-            if len(hist) >= 66:  # 3 months
-                price_3m_ago = hist['Close'].iloc[-66]
-                momentum_3m = (current_price - price_3m_ago) / price_3m_ago * 100
-            else:
-                momentum_3m = None
-                
-            if len(hist) >= 132:  # 6 months
-                price_6m_ago = hist['Close'].iloc[-132]
-                momentum_6m = (current_price - price_6m_ago) / price_6m_ago * 100
-            else:
-                momentum_6m = None
+            # Calculate momentum over 1, 3 and 6 month lookbacks
+            momentum_1m, momentum_3m, momentum_6m = (
+                (current_price - close[-days]) / close[-days] * 100 if n >= days else None
+                for days in (22, 66, 132)
+            )
             
             # Long-term RSI (200-day if available)
-            if len(hist) >= 200:
-                rsi_long = self._calculate_rsi(hist['Close'], 200)
-            else:
-                rsi_long = None
+            rsi_long = self._calculate_rsi(hist['Close'], 200) if n >= 200 else None
             
             momentum = MomentumMetrics(
                 price_momentum_1m=momentum_1m,
@@ -405,66 +972,51 @@ class ComprehensiveAnalyzer:
             print(f"Warning: Momentum analysis failed for {symbol}: {e}")
             return MomentumMetrics()
     
-    def _analyze_risk(self, ticker, symbol: str) -> RiskMetrics:
+    def _analyze_risk(self, info: dict, hist: pd.DataFrame, symbol: str) -> RiskMetrics:
         """Perform advanced risk analysis"""
         try:
-            hist = ticker.history(period="2y")
-            info = ticker.info
-            
             if len(hist) < 50:
                 return RiskMetrics()
             
-            returns = hist['Close'].pct_change().dropna()
+            returns = hist['Close'].astype(np.float64).pct_change().dropna()
             
             # Beta calculation (vs SPY)
             try:
-                spy_hist = yf.Ticker("SPY").history(period="2y")
-                spy_returns = spy_hist['Close'].pct_change().dropna()
+                spy_hist = self.market_data.get_history("SPY", "2y")
+                spy_returns = spy_hist['Close'].astype(np.float64).pct_change().dropna()
                 
                 # Align dates
-                combined_returns = pd.merge(returns, spy_returns, 
-                                          left_index=True, right_index=True, 
-                                          suffixes=('_stock', '_spy'))
-                if len(combined_returns) > 50:
-                    covariance = combined_returns['Close_stock'].cov(combined_returns['Close_spy'])
-                    spy_variance = combined_returns['Close_spy'].var()
-                    beta = covariance / spy_variance if spy_variance > 0 else None
+                stock_aligned, spy_aligned = self._align_values(returns, spy_returns)
+                if len(stock_aligned) > 50:
+                    cov = np.cov(stock_aligned, spy_aligned, ddof=1)
+                    beta = float(cov[0, 1] / cov[1, 1]) if cov[1, 1] > 0 else None
                 else:
                     beta = None
-            except:
+            except Exception:
                 beta = info.get('beta')
             
-            # Risk metrics calculations
-            annual_return = returns.mean() * 252
-            annual_volatility = returns.std() * math.sqrt(252)
+            # Risk metrics calculations (one pass over the returns array)
+            returns_arr = returns.to_numpy(dtype=np.float64, na_value=np.nan)
+            mean_return, return_std, downside_std, drawdown, std_30d, std_90d = _risk_stats(returns_arr)
+            annual_return = mean_return * 252
+            annual_volatility = return_std * math.sqrt(252)
             
             # Sharpe Ratio
             sharpe_ratio = (annual_return - self.risk_free_rate) / annual_volatility if annual_volatility > 0 else None
             
             # Sortino Ratio (using downside deviation)
-            negative_returns = returns[returns < 0]
-            downside_deviation = negative_returns.std() * math.sqrt(252) if len(negative_returns) > 0 else 0
+            downside_deviation = downside_std * math.sqrt(252)
             sortino_ratio = (annual_return - self.risk_free_rate) / downside_deviation if downside_deviation > 0 else None
             
             # Maximum Drawdown
-            cumulative_returns = (1 + returns).cumprod()
-            running_max = cumulative_returns.expanding().max()
-            drawdown = (cumulative_returns - running_max) / running_max
-            max_drawdown = drawdown.min() * 100  # Convert to percentage
+            max_drawdown = drawdown * 100  # Convert to percentage
             
             # Value at Risk (95% confidence)
-            var_95 = np.percentile(returns, 5) * 100  # 5th percentile
+            var_95 = self._lower_percentile(returns_arr, 5) * 100  # 5th percentile
             
             # Volatilities
-            if len(returns) >= 30:
-                volatility_30d = returns.tail(30).std() * math.sqrt(252) * 100
-            else:
-                volatility_30d = None
-                
-            if len(returns) >= 90:
-                volatility_90d = returns.tail(90).std() * math.sqrt(252) * 100
-            else:
-                volatility_90d = None
+            volatility_30d = std_30d * math.sqrt(252) * 100 if len(returns_arr) >= 30 else None
+            volatility_90d = std_90d * math.sqrt(252) * 100 if len(returns_arr) >= 90 else None
             
             risk_metrics = RiskMetrics(
                 beta=beta,
@@ -486,11 +1038,9 @@ class ComprehensiveAnalyzer:
             print(f"Warning: Risk analysis failed for {symbol}: {e}")
             return RiskMetrics()
     
-    def _analyze_valuation(self, ticker, symbol: str) -> ValuationMetrics:
+    def _analyze_valuation(self, info: dict, symbol: str) -> ValuationMetrics:
         """Perform advanced valuation analysis"""
         try:
-            info = ticker.info
-            
             current_price = info.get('currentPrice', info.get('regularMarketPrice'))
             if not current_price:
                 return ValuationMetrics()
@@ -548,21 +1098,17 @@ class ComprehensiveAnalyzer:
             print(f"Warning: Valuation analysis failed for {symbol}: {e}")
             return ValuationMetrics()
     
-    def _analyze_quality(self, ticker, symbol: str) -> QualityMetrics:
+    def _analyze_quality(self, info: dict, fin_latest: dict, cf_latest: dict,
+                         symbol: str) -> QualityMetrics:
         """Analyze earnings and financial quality"""
         try:
-            cash_flow = ticker.cashflow
-            financials = ticker.financials
-            info = ticker.info
-            
             red_flags = []
             
             # Cash flow to earnings ratio
-            if not cash_flow.empty and not financials.empty:
+            operating_cash_flow = cf_latest.get('Total Cash From Operating Activities')
+            net_income = fin_latest.get('Net Income')
+            if operating_cash_flow is not None and net_income is not None:
                 try:
-                    operating_cash_flow = cash_flow.loc['Total Cash From Operating Activities'].iloc[0]
-                    net_income = financials.loc['Net Income'].iloc[0]
-                    
                     if net_income and net_income != 0:
                         cf_to_earnings = operating_cash_flow / net_income
                         
@@ -571,7 +1117,7 @@ class ComprehensiveAnalyzer:
                             red_flags.append("Low cash flow relative to earnings")
                     else:
                         cf_to_earnings = None
-                except:
+                except DATA_ERRORS:
                     cf_to_earnings = None
             else:
                 cf_to_earnings = None
@@ -582,7 +1128,7 @@ class ComprehensiveAnalyzer:
                     accruals_ratio = 1 - cf_to_earnings
                 else:
                     accruals_ratio = None
-            except:
+            except DATA_ERRORS:
                 accruals_ratio = None
             
             # Management efficiency (simplified ROA trend)
@@ -596,13 +1142,15 @@ class ComprehensiveAnalyzer:
                 red_flags.append("Very high debt-to-equity ratio")
             
             # Calculate earnings quality score
-            earnings_quality = self._calculate_earnings_quality(cf_to_earnings, accruals_ratio, red_flags)
+            red_flag_count = len(red_flags)
+            earnings_quality = self._calculate_earnings_quality(cf_to_earnings, accruals_ratio, red_flag_count)
             
             quality = QualityMetrics(
                 earnings_quality=earnings_quality,
                 accruals_ratio=accruals_ratio,
                 cash_flow_to_earnings=cf_to_earnings,
-                accounting_red_flags=red_flags
+                accounting_red_flags=red_flags,
+                red_flag_count=red_flag_count
             )
             
             # Calculate overall quality score
@@ -614,10 +1162,9 @@ class ComprehensiveAnalyzer:
             print(f"Warning: Quality analysis failed for {symbol}: {e}")
             return QualityMetrics()
     
-    def _analyze_macro_context(self, ticker, symbol: str) -> MacroContextMetrics:
+    def _analyze_macro_context(self, info: dict, symbol: str) -> MacroContextMetrics:
         """Analyze macroeconomic context"""
         try:
-            info = ticker.info
             sector = info.get('sector', '')
             
             # Simple sector-based sensitivity analysis
@@ -637,63 +1184,58 @@ class ComprehensiveAnalyzer:
     # Helper calculation methods
     
     def _calculate_rsi(self, prices: pd.Series, period: int = 14) -> Optional[float]:
-        """Calculate RSI indicator"""
+        """Calculate RSI indicator (Wilder smoothing)"""
         try:
-            delta = prices.diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-            rs = gain / loss
-            rsi = 100 - (100 / (1 + rs))
-            return rsi.iloc[-1] if not rsi.empty else None
-        except:
+            values = prices.to_numpy(dtype=np.float64, na_value=np.nan)
+            if len(values) <= period:
+                return None
+            return float(_rsi_last(values, period))
+        except DATA_ERRORS:
             return None
     
-    def _calculate_piotroski_score(self, info: dict, financials: pd.DataFrame, 
-                                  balance_sheet: pd.DataFrame, cash_flow: pd.DataFrame) -> Optional[int]:
+    def _lower_percentile(self, values: np.ndarray, q: float) -> float:
+        """np.percentile (linear interpolation) via a partial partition instead of a full sort"""
+        pos = q / 100 * (len(values) - 1)
+        lo = int(pos)
+        hi = min(lo + 1, len(values) - 1)
+        part = np.partition(values, (lo, hi))
+        return float(part[lo] + (part[hi] - part[lo]) * (pos - lo))
+    
+    def _calculate_piotroski_score(self, info: dict, fin_latest: dict,
+                                  bs_latest: dict, cf_latest: dict) -> Optional[int]:
         """Calculate Piotroski F-Score (simplified version)"""
         try:
-            score = 0
-            
-            # Profitability (4 points)
             roa = info.get('returnOnAssets')
-            if roa and roa > 0:
-                score += 1
-                
-            if not cash_flow.empty and 'Total Cash From Operating Activities' in cash_flow.index:
-                ocf = cash_flow.loc['Total Cash From Operating Activities'].iloc[0]
-                if ocf > 0:
-                    score += 1
+            ocf = cf_latest.get('Total Cash From Operating Activities')
+            debt_to_equity = info.get('debtToEquity')
+            current_ratio = info.get('currentRatio')
             
             # Operating efficiency would require historical data
             # Simplified: assume 2 more points for established companies
-            if info.get('marketCap', 0) > 10e9:  # Large cap
-                score += 2
-            
-            # Leverage, liquidity (3 points)
-            debt_to_equity = info.get('debtToEquity')
-            if debt_to_equity and debt_to_equity < 50:  # Low debt
-                score += 1
-                
-            current_ratio = info.get('currentRatio')
-            if current_ratio and current_ratio > 1.2:
-                score += 1
-                
-            # Outstanding shares (would need historical data)
-            score += 1  # Assume no dilution for simplicity
+            large_cap = bool(info.get('marketCap', 0) > 10e9)
+            
+            # One bit per passed test, so the score is a popcount:
+            # profitability (bits 0-3), leverage/liquidity (4-5), no dilution assumed (6)
+            flags = (
+                bool(roa and roa > 0)
+                | bool(ocf is not None and ocf > 0) << 1
+                | large_cap << 2
+                | large_cap << 3
+                | bool(debt_to_equity and debt_to_equity < 50) << 4
+                | bool(current_ratio and current_ratio > 1.2) << 5
+                | 1 << 6
+            )
             
-            return min(score, 9)  # Cap at 9
+            return min(flags.bit_count(), 9)  # Cap at 9
             
-        except:
+        except DATA_ERRORS:
             return None
     
-    def _calculate_altman_z_score(self, info: dict, balance_sheet: pd.DataFrame) -> Optional[float]:
+    def _calculate_altman_z_score(self, info: dict, bs_latest: dict) -> Optional[float]:
         """Calculate Altman Z-Score for bankruptcy prediction"""
         try:
-            if balance_sheet.empty:
-                return None
-                
             # Need specific balance sheet items
-            total_assets = balance_sheet.loc['Total Assets'].iloc[0] if 'Total Assets' in balance_sheet.index else None
+            total_assets = bs_latest.get('Total Assets')
             if not total_assets:
                 return None
                 
@@ -707,7 +1249,7 @@ class ComprehensiveAnalyzer:
             
             return z_score
             
-        except:
+        except DATA_ERRORS:
             return None
     
     def _simple_dcf_estimate(self, info: dict) -> Optional[float]:
@@ -715,268 +1257,114 @@ class ComprehensiveAnalyzer:
         try:
             free_cash_flow = info.get('freeCashflow')
             growth_rate = info.get('earningsGrowth', 0.05)  # Default 5%
+            shares_outstanding = info.get('sharesOutstanding')
             
-            if not free_cash_flow or free_cash_flow <= 0:
+            # Missing inputs are the common case; bail out before any arithmetic
+            if not free_cash_flow or free_cash_flow <= 0 or growth_rate is None or not shares_outstanding:
                 return None
             
-            # Simple 2-stage DCF
-            # Stage 1: High growth for 5 years
-            # Stage 2: Terminal growth of 3%
-            
-            terminal_growth = 0.03
-            discount_rate = 0.10  # 10% WACC assumption
-            
-            # Calculate present value of cash flows
-            pv_sum = 0
-            for year in range(1, 6):  # 5 years
-                future_cf = free_cash_flow * ((1 + growth_rate) ** year)
-                pv = future_cf / ((1 + discount_rate) ** year)
-                pv_sum += pv
-            
-            # Terminal value
-            terminal_cf = free_cash_flow * ((1 + growth_rate) ** 5) * (1 + terminal_growth)
-            terminal_value = terminal_cf / (discount_rate - terminal_growth)
-            terminal_pv = terminal_value / ((1 + discount_rate) ** 5)
-            
-            total_pv = pv_sum + terminal_pv
+            total_pv = _dcf_present_value(float(free_cash_flow), float(growth_rate),
+                                          DCF_DISCOUNT_RATE, DCF_TERMINAL_GROWTH, DCF_YEARS)
             
             # Convert to per-share value
-            shares_outstanding = info.get('sharesOutstanding')
-            if shares_outstanding:
-                dcf_per_share = total_pv / shares_outstanding
-                return dcf_per_share
-            
-            return None
+            return total_pv / shares_outstanding
             
-        except:
+        except DATA_ERRORS:
             return None
     
-    def _estimate_interest_sensitivity(self, sector: str) -> Optional[float]:
+    # Sector lookups see a handful of distinct strings; memoized so repeat calls skip the Python frame
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def _estimate_interest_sensitivity(sector: str) -> Optional[float]:
         """Estimate interest rate sensitivity by sector"""
-        sensitivity_map = {
-            'Real Estate': 0.8,
-            'Utilities': 0.7,
-            'Financial Services': 0.6,
-            'Consumer Cyclical': 0.4,
-            'Technology': 0.2,
-            'Healthcare': 0.1,
-            'Consumer Defensive': 0.1
-        }
-        return sensitivity_map.get(sector, 0.3)
+        return _INTEREST_SENSITIVITY.get(sector, 0.3)
     
-    def _estimate_inflation_impact(self, sector: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def _estimate_inflation_impact(sector: str) -> str:
         """Estimate inflation impact by sector"""
-        impact_map = {
-            'Energy': 'Positive',
-            'Materials': 'Positive', 
-            'Real Estate': 'Mixed',
-            'Financial Services': 'Mixed',
-            'Consumer Defensive': 'Negative',
-            'Technology': 'Negative',
-            'Healthcare': 'Negative'
-        }
-        return impact_map.get(sector, 'Neutral')
+        return _INFLATION_IMPACT.get(sector, 'Neutral')
     
     # Scoring methods
     
     def _calculate_health_score(self, health: FinancialHealthMetrics) -> float:
         """Calculate financial health score (0-100)"""
-        score = 50  # Base score
-        
-        if health.piotroski_score:
-            # Piotroski score contributes 0-30 points
-            score += (health.piotroski_score / 9) * 30
-            
-        if health.altman_z_score:
-            if health.altman_z_score > 3.0:
-                score += 20  # Safe zone
-            elif health.altman_z_score > 1.8:
-                score += 10  # Gray zone
-            else:
-                score -= 20  # Distress zone
-        
-        return max(0, min(100, score))
+        return _health_score(_metric(health.piotroski_score), _metric(health.altman_z_score))
     
     def _calculate_momentum_score(self, momentum: MomentumMetrics) -> float:
         """Calculate momentum score (0-100)"""
-        score = 50
-        
-        if momentum.price_momentum_1m:
-            if momentum.price_momentum_1m > 10:
-                score += 20
-            elif momentum.price_momentum_1m > 0:
-                score += 10
-            elif momentum.price_momentum_1m < -10:
-                score -= 20
-            else:
-                score -= 10
-                
-        return max(0, min(100, score))
+        return _momentum_score(_metric(momentum.price_momentum_1m))
     
     def _calculate_risk_score(self, risk: RiskMetrics) -> float:
         """Calculate risk score (0-100, higher is better/safer)"""
-        score = 50
-        
-        if risk.sharpe_ratio:
-            if risk.sharpe_ratio > 1.0:
-                score += 25
-            elif risk.sharpe_ratio > 0.5:
-                score += 15
-            elif risk.sharpe_ratio < 0:
-                score -= 20
-                
-        if risk.max_drawdown:
-            if risk.max_drawdown > -10:
-                score += 15
-            elif risk.max_drawdown > -20:
-                score += 5
-            elif risk.max_drawdown < -40:
-                score -= 25
-                
-        return max(0, min(100, score))
+        return _risk_score(_metric(risk.sharpe_ratio), _metric(risk.max_drawdown))
     
     def _calculate_valuation_score(self, valuation: ValuationMetrics, current_price: float) -> float:
         """Calculate valuation score (0-100)"""
-        score = 50
-        
-        if valuation.dcf_estimate and current_price:
-            ratio = current_price / valuation.dcf_estimate
-            if ratio < 0.8:  # Trading below DCF
-                score += 25
-            elif ratio < 1.0:
-                score += 15
-            elif ratio > 1.5:
-                score -= 25
-            elif ratio > 1.2:
-                score -= 15
-                
-        if valuation.price_to_fcf:
-            if valuation.price_to_fcf < 15:
-                score += 15
-            elif valuation.price_to_fcf > 30:
-                score -= 15
-                
-        return max(0, min(100, score))
+        return _valuation_score(_metric(valuation.dcf_estimate), _metric(current_price),
+                                _metric(valuation.price_to_fcf))
     
     def _calculate_quality_score(self, quality: QualityMetrics) -> float:
         """Calculate quality score (0-100)"""
-        score = 70  # Start higher for quality
-        
-        if quality.cash_flow_to_earnings:
-            if quality.cash_flow_to_earnings > 1.2:
-                score += 20
-            elif quality.cash_flow_to_earnings > 0.8:
-                score += 10
-            else:
-                score -= 20
-                
-        # Penalize for red flags
-        score -= len(quality.accounting_red_flags) * 10
-        
-        return max(0, min(100, score))
+        return _quality_score(_metric(quality.cash_flow_to_earnings), quality.red_flag_count)
     
     def _calculate_earnings_quality(self, cf_to_earnings: Optional[float], 
-                                  accruals_ratio: Optional[float], red_flags: List[str]) -> Optional[float]:
+                                  accruals_ratio: Optional[float], red_flag_count: int) -> Optional[float]:
         """Calculate earnings quality score"""
-        if not cf_to_earnings:
-            return None
-            
-        quality = 80  # Start high
-        
-        if cf_to_earnings < 0.8:
-            quality -= 30
-        elif cf_to_earnings < 1.0:
-            quality -= 10
-            
-        quality -= len(red_flags) * 15
-        
-        return max(0, min(100, quality))
+        quality = _earnings_quality(_metric(cf_to_earnings), red_flag_count)
+        return None if math.isnan(quality) else quality
     
-    def _calculate_composite_score(self, health: FinancialHealthMetrics, valuation: ValuationMetrics,
-                                 quality: QualityMetrics, momentum: MomentumMetrics, 
-                                 risk: RiskMetrics) -> float:
+    def _calculate_composite_score(self, scores: Tuple[float, ...]) -> float:
         """Calculate composite comprehensive score"""
-        scores = {
-            'financial_health': health.score,
-            'valuation': valuation.valuation_score,
-            'quality': quality.score,
-            'momentum': momentum.score,
-            'risk': risk.risk_score
-        }
-        
-        weighted_sum = 0
-        total_weight = 0
-        
-        for component, score in scores.items():
-            if score > 0:  # Only include components with valid scores
-                weight = self.composite_weights.get(component, 0.1)
-                weighted_sum += score * weight
-                total_weight += weight
-        
-        return weighted_sum / total_weight if total_weight > 0 else 50
+        # Only include components with valid scores
+        weights = tuple(w if score > 0 else 0.0 for score, w in zip(scores, self._composite_w))
+        total_weight = sum(weights)
+        return sumprod(scores, weights) / total_weight if total_weight > 0 else 50
+    
+    def _composite_scores(self, matrix: np.ndarray) -> np.ndarray:
+        """Composite score for each row of an (N, K) component score matrix"""
+        # Only valid components count; zeroing the rest also keeps NaN scores out of the products
+        valid = matrix > 0
+        weighted_sum = np.einsum('ij,j->i', np.where(valid, matrix, 0.0), self._score_weights)
+        total_weight = np.einsum('ij,j->i', valid.astype(np.float64), self._score_weights)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(total_weight > 0, weighted_sum / total_weight, 50.0)
     
-    def _calculate_confidence(self, options: OptionsMetrics, health: FinancialHealthMetrics,
-                            quality: QualityMetrics) -> float:
+    def _calculate_confidence(self, signal_values: np.ndarray) -> float:
         """Calculate confidence in the analysis"""
-        confidence = 0.7  # Base confidence
-        
-        # Data completeness factor
-        if health.piotroski_score:
-            confidence += 0.1
-        if health.altman_z_score:
-            confidence += 0.1
-        if quality.cash_flow_to_earnings:
-            confidence += 0.1
-            
-        return min(0.95, confidence)
-    
-    def _generate_key_insights(self, symbol: str, health: FinancialHealthMetrics, 
-                             valuation: ValuationMetrics, quality: QualityMetrics,
-                             momentum: MomentumMetrics, risk: RiskMetrics) -> List[str]:
+        # Data completeness factor: pack metric presence into a bitmask and look it up
+        mask = int((~np.isnan(signal_values[_CONFIDENCE_FIELDS])) @ _CONFIDENCE_BITS)
+        return float(_CONFIDENCE_BY_MASK[mask])
+    
+    def _confidence_levels(self, signal_matrix: np.ndarray) -> np.ndarray:
+        """Vectorized _calculate_confidence over an (N, len(SIGNAL_FIELDS)) signal matrix"""
+        masks = (~np.isnan(signal_matrix[:, _CONFIDENCE_FIELDS])) @ _CONFIDENCE_BITS
+        return _CONFIDENCE_BY_MASK[masks]
+    
+    def _rule_hits(self, table: tuple, signal_values: np.ndarray) -> np.ndarray:
+        """Evaluate every rule of a compiled table against one signal vector or a matrix of them"""
+        fields, ops, thresholds, _ = table
+        values = signal_values[..., fields]
+        with np.errstate(invalid='ignore'):
+            return np.choose(ops, [values > thresholds, values >= thresholds,
+                                   values < thresholds, values <= thresholds])
+    
+    def _format_rules(self, table: tuple, hits: np.ndarray, signals: Dict[str, Any]) -> List[str]:
+        """Messages for the rules that fired"""
+        messages = table[3]
+        return [messages[i].format(**signals) for i in np.flatnonzero(hits)]
+    
+    def _evaluate_rules(self, table: tuple, signal_values: np.ndarray, signals: Dict[str, Any]) -> List[str]:
+        """Evaluate a compiled rule table in one vectorized pass and format the hits"""
+        return self._format_rules(table, self._rule_hits(table, signal_values), signals)
+    
+    def _generate_key_insights(self, signal_values: np.ndarray, signals: Dict[str, Any]) -> List[str]:
         """Generate key insights from analysis"""
-        insights = []
-        
-        # Financial health insights
-        if health.piotroski_score and health.piotroski_score >= 7:
-            insights.append(f"Strong financial health (Piotroski score: {health.piotroski_score}/9)")
-        elif health.piotroski_score and health.piotroski_score <= 3:
-            insights.append(f"Weak financial health (Piotroski score: {health.piotroski_score}/9)")
-            
-        # Valuation insights
-        if valuation.dcf_estimate:
-            current_price = 100  # Placeholder - would get from ticker
-            if valuation.dcf_estimate > current_price * 1.2:
-                insights.append("Trading below estimated intrinsic value")
-            elif valuation.dcf_estimate < current_price * 0.8:
-                insights.append("Trading above estimated intrinsic value")
-        
-        # Quality insights
-        if quality.cash_flow_to_earnings and quality.cash_flow_to_earnings > 1.2:
-            insights.append("Strong cash flow generation relative to earnings")
-            
-        # Risk insights
-        if risk.max_drawdown and risk.max_drawdown > -10:
-            insights.append("Low historical volatility and drawdown")
-        elif risk.max_drawdown and risk.max_drawdown < -30:
-            insights.append("High historical volatility with significant drawdowns")
-            
-        return insights[:5]  # Limit to top 5 insights
+        return self._evaluate_rules(_INSIGHT_TABLE, signal_values, signals)[:5]  # Limit to top 5 insights
     
-    def _generate_warnings(self, health: FinancialHealthMetrics, quality: QualityMetrics,
-                         risk: RiskMetrics) -> List[str]:
+    def _generate_warnings(self, signal_values: np.ndarray, signals: Dict[str, Any]) -> List[str]:
         """Generate warnings from analysis"""
-        warnings = []
-        
-        if health.altman_z_score and health.altman_z_score < 1.8:
-            warnings.append("⚠️ Elevated bankruptcy risk (low Altman Z-score)")
-            
-        if quality.accounting_red_flags:
-            warnings.append(f"⚠️ {len(quality.accounting_red_flags)} accounting red flags detected")
-            
-        if risk.max_drawdown and risk.max_drawdown < -40:
-            warnings.append("⚠️ Very high historical volatility and drawdowns")
-            
-        return warnings
+        return self._evaluate_rules(_WARNING_TABLE, signal_values, signals)
 
 
 # Example usage and testing
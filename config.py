@@ -2,10 +2,25 @@
 Configuration management for Financial Research Agents
 """
 import os
-import json
+import orjson
+import pickle
+import re
+import sys
+import tempfile
+import time
+from collections import deque
+from datetime import date
 from pathlib import Path
-from dataclasses import dataclass, asdict
-from typing import Dict, List, Optional
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+# Number of symbols kept in the recent analyses list
+MAX_RECENT_ANALYSES = 10
+
+# Day-keyed pickles written by store_pickle, e.g. AAPL_info_2024-06-28.pkl
+_DATED_PICKLE = re.compile(r"_\d{4}-\d{2}-\d{2}\.pkl$")
+# Temp files older than this are leftovers from an interrupted store_pickle
+STALE_TEMP_AGE = 60 * 60  # seconds
 
 
 @dataclass
@@ -95,6 +110,17 @@ class FinancialAgentConfig:
         )
 
 
+# Config file section names and the dataclass each one loads into, fixed at import time
+_SECTIONS = (
+    ('analysis_weights', AnalysisWeights),
+    ('fundamental_weights', FundamentalWeights),
+    ('technical_weights', TechnicalWeights),
+    ('recommendation_thresholds', RecommendationThresholds),
+    ('display_settings', DisplaySettings),
+    ('api_settings', APISettings),
+)
+
+
 class ConfigManager:
     """Configuration file manager"""
     
@@ -110,33 +136,51 @@ class ConfigManager:
         self.cache_dir.mkdir(exist_ok=True)
         
         self._config: Optional[FinancialAgentConfig] = None
+        self._config_mtime_ns: Optional[int] = None
+        self._watchlist_set: set = set()  # Mirror of config.watchlist for O(1) membership
+        # Bounded mirror of config.recent_analyses (newest first) plus its membership set
+        self._recent: deque = deque(maxlen=MAX_RECENT_ANALYSES)
+        self._recent_set: set = set()
+        self._pruned_on: Optional[date] = None  # Day the stale pickle sweep last ran
+    
+    def _sync_mirrors(self, config: FinancialAgentConfig) -> None:
+        """Rebuild the watchlist/recent analyses lookup structures from config"""
+        self._watchlist_set = set(config.watchlist)
+        self._recent = deque(config.recent_analyses, maxlen=MAX_RECENT_ANALYSES)
+        self._recent_set = set(self._recent)
+    
+    def _config_file_mtime_ns(self) -> Optional[int]:
+        """Modification time of the config file, or None if it doesn't exist"""
+        try:
+            return self.config_file.stat().st_mtime_ns
+        except OSError:
+            return None
     
     def load_config(self) -> FinancialAgentConfig:
         """Load configuration from file or create default"""
-        if self._config is not None:
+        mtime_ns = self._config_file_mtime_ns()
+        
+        # Reuse the parsed config unless the file changed on disk since we last read or wrote it
+        if self._config is not None and (mtime_ns is None or mtime_ns == self._config_mtime_ns):
             return self._config
         
-        if self.config_file.exists():
+        if mtime_ns is not None:
             try:
-                with open(self.config_file, 'r') as f:
-                    data = json.load(f)
+                data = orjson.loads(self.config_file.read_bytes())
                 
                 # Convert dict back to dataclass instances
                 config = FinancialAgentConfig(
-                    analysis_weights=AnalysisWeights(**data['analysis_weights']),
-                    fundamental_weights=FundamentalWeights(**data['fundamental_weights']),
-                    technical_weights=TechnicalWeights(**data['technical_weights']),
-                    recommendation_thresholds=RecommendationThresholds(**data['recommendation_thresholds']),
-                    display_settings=DisplaySettings(**data['display_settings']),
-                    api_settings=APISettings(**data['api_settings']),
+                    **{name: section(**data[name]) for name, section in _SECTIONS},
                     watchlist=data.get('watchlist', []),
                     recent_analyses=data.get('recent_analyses', [])
                 )
                 
                 self._config = config
+                self._config_mtime_ns = mtime_ns
+                self._sync_mirrors(config)
                 return config
                 
-            except (json.JSONDecodeError, KeyError, TypeError) as e:
+            except (orjson.JSONDecodeError, KeyError, TypeError) as e:
                 print(f"Error loading config: {e}")
                 print("Using default configuration")
         
@@ -149,22 +193,18 @@ class ConfigManager:
     def save_config(self, config: FinancialAgentConfig) -> None:
         """Save configuration to file"""
         try:
-            # Convert dataclasses to dictionaries
+            # Section dataclasses only hold scalars, so their instance dicts serialize as-is
             config_dict = {
-                'analysis_weights': asdict(config.analysis_weights),
-                'fundamental_weights': asdict(config.fundamental_weights),
-                'technical_weights': asdict(config.technical_weights),
-                'recommendation_thresholds': asdict(config.recommendation_thresholds),
-                'display_settings': asdict(config.display_settings),
-                'api_settings': asdict(config.api_settings),
+                **{name: vars(getattr(config, name)) for name, _ in _SECTIONS},
                 'watchlist': config.watchlist,
                 'recent_analyses': config.recent_analyses
             }
             
-            with open(self.config_file, 'w') as f:
-                json.dump(config_dict, f, indent=2)
+            self.config_file.write_bytes(orjson.dumps(config_dict, option=orjson.OPT_INDENT_2))
             
             self._config = config
+            self._config_mtime_ns = self._config_file_mtime_ns()
+            self._sync_mirrors(config)
             
         except Exception as e:
             print(f"Error saving config: {e}")
@@ -172,40 +212,114 @@ class ConfigManager:
     def update_watchlist(self, symbols: List[str]) -> None:
         """Update watchlist and save"""
         config = self.load_config()
-        config.watchlist = list(set(symbols))  # Remove duplicates
+        config.watchlist = list(dict.fromkeys(symbols))  # Remove duplicates, keeping order
         self.save_config(config)
     
     def add_to_watchlist(self, symbol: str) -> None:
         """Add symbol to watchlist"""
         config = self.load_config()
-        if symbol not in config.watchlist:
+        if symbol not in self._watchlist_set:
             config.watchlist.append(symbol)
             self.save_config(config)
     
     def remove_from_watchlist(self, symbol: str) -> None:
         """Remove symbol from watchlist"""
         config = self.load_config()
-        if symbol in config.watchlist:
+        if symbol in self._watchlist_set:
             config.watchlist.remove(symbol)
             self.save_config(config)
     
     def add_recent_analysis(self, symbol: str) -> None:
         """Add to recent analyses (keep last 10)"""
         config = self.load_config()
-        if symbol in config.recent_analyses:
-            config.recent_analyses.remove(symbol)
-        config.recent_analyses.insert(0, symbol)
-        config.recent_analyses = config.recent_analyses[:10]  # Keep only last 10
+        if symbol in self._recent_set:
+            self._recent.remove(symbol)
+        self._recent.appendleft(symbol)  # deque maxlen drops the oldest entry
+        config.recent_analyses = list(self._recent)
         self.save_config(config)
     
-    def get_cache_file(self, symbol: str) -> Path:
+    def get_cache_file(self, symbol: str, suffix: str = ".json") -> Path:
         """Get cache file path for a symbol"""
-        return self.cache_dir / f"{symbol}.json"
+        return self.cache_dir / f"{symbol}{suffix}"
+    
+    def _cache_duration(self) -> int:
+        """api_settings.cache_duration from the loaded config, without re-checking the file per lookup"""
+        if self._config is None:
+            self.load_config()
+        return self._config.api_settings.cache_duration
+    
+    def _dated_cache_file(self, name: str) -> Path:
+        """Cache path for a pickled object, keyed by name and today's date"""
+        return self.get_cache_file(f"{name}_{date.today().isoformat()}", suffix=".pkl")
+    
+    def load_pickle(self, name: str) -> Any:
+        """Object saved by store_pickle today within api_settings.cache_duration, or None"""
+        cache_file = self._dated_cache_file(name)
+        try:
+            if time.time() - cache_file.stat().st_mtime >= self._cache_duration():
+                return None
+            return pickle.loads(cache_file.read_bytes())
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Warning: Ignoring unreadable cache entry {name}: {e}")
+            return None
+    
+    def store_pickle(self, name: str, value: Any) -> None:
+        """Persist an object for load_pickle; readers in other processes never see a partial file"""
+        self._prune_stale_pickles()
+        cache_file = self._dated_cache_file(name)
+        try:
+            fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=f".{cache_file.name}.", suffix=".tmp")
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(temp_path, cache_file)
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+        except Exception as e:
+            print(f"Warning: Failed to cache {name}: {e}")
+    
+    def _prune_stale_pickles(self) -> None:
+        """Once a day, delete pickles keyed to earlier days and abandoned temp files"""
+        today = date.today()
+        if self._pruned_on == today:
+            return
+        self._pruned_on = today
+        
+        current_suffix = f"_{today.isoformat()}.pkl"
+        stale_before = time.time() - STALE_TEMP_AGE
+        try:
+            with os.scandir(self.cache_dir) as entries:
+                for entry in entries:
+                    try:
+                        if _DATED_PICKLE.search(entry.name):
+                            if not entry.name.endswith(current_suffix):
+                                os.unlink(entry.path)
+                        elif entry.name.endswith('.tmp') and entry.stat().st_mtime < stale_before:
+                            os.unlink(entry.path)
+                    except OSError:
+                        pass  # Another process removed or replaced it first
+        except OSError as e:
+            print(f"Warning: Failed to prune cache directory: {e}")
     
     def clear_cache(self) -> None:
         """Clear all cached data"""
-        for cache_file in self.cache_dir.glob("*.json"):
-            cache_file.unlink()
+        # scandir hands back the file type from the directory listing, so no per-entry stat or Path object
+        with os.scandir(self.cache_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(('.json', '.pkl')) and entry.is_file():
+                    os.unlink(entry.path)
+        
+        # The sqlite response cache shares this directory; imported lazily since it imports config,
+        # and only when it's in use so clearing doesn't create an empty cache.db
+        if 'cache_manager' in sys.modules or (self.cache_dir / 'cache.db').exists():
+            try:
+                from cache_manager import cache_manager
+                cache_manager.clear_all()
+            except Exception as e:
+                print(f"Warning: Failed to clear response cache: {e}")
 
 
 # Global config manager instance
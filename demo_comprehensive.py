@@ -4,6 +4,7 @@ Demo script showing comprehensive analysis features
 """
 import sys
 from financial_agent_rich import FinancialAgentRich
+from comprehensive_analyzer import ComprehensiveAnalyzer
 
 
 def demo_comprehensive_analysis():
@@ -41,6 +42,7 @@ def demo_comprehensive_analysis():
     print("   • Type 'comprehensive' at the prompt")
     print("   • Enter any stock ticker (e.g., AAPL, TSLA, MSFT)")
     print("   • View detailed multi-panel analysis")
+    print(f"   • Or score a watchlist: python demo_comprehensive.py {' '.join(test_symbols)}")
     
     print("\n🔥 What's New vs Basic Analysis:")
     print("   • 4 additional analysis panels (Health, Risk, Valuation, Quality)")
@@ -55,5 +57,25 @@ def demo_comprehensive_analysis():
     print("Try it out: python financial_agent_rich.py")
 
 
+def demo_watchlist(symbols):
+    """Analyze a watchlist in one batch and print the component score panel"""
+    print(f"🔬 Comprehensive analysis for {', '.join(symbols)}")
+    print("=" * 60)
+    
+    analyzer = ComprehensiveAnalyzer()
+    analyses = analyzer.analyze_many(symbols)
+    panel = analyzer.score_panel(analyses).sort_values('composite', ascending=False)
+    
+    print("\n📊 Component scores (0-100), best composite first:")
+    print(panel.round(1).to_string())
+    
+    for symbol in panel.index:
+        for warning in analyses[symbol].warnings:
+            print(f"   {symbol}: {warning}")
+
+
 if __name__ == "__main__":
-    demo_comprehensive_analysis()
\ No newline at end of file
+    if len(sys.argv) > 1:
+        demo_watchlist([symbol.upper() for symbol in sys.argv[1:]])
+    else:
+        demo_comprehensive_analysis()
\ No newline at end of file
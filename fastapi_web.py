@@ -4,26 +4,170 @@ Web-based Financial Research Agent using FastAPI
 Alternative to textual-web that works with Railway deployment
 """
 
-from fastapi import FastAPI, Request, Form, BackgroundTasks
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi import FastAPI, Request, Response, Form, BackgroundTasks, HTTPException
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import HTMLResponse, JSONResponse, ORJSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from pydantic import BaseModel
 import asyncio
-import json
+import atexit
+import gzip
+import hashlib
+import logging
+import orjson
 import os
+import re
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional, Dict, Any
 
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # Response cache is optional
+    aioredis = None
+
+try:
+    import brotli
+except ImportError:  # Brotli home page encoding is optional; gzip is always available
+    brotli = None
+
+try:
+    import fcntl
+except ImportError:  # No flock on Windows; warm-up then stays off under multiple workers
+    fcntl = None
+
 from finance_core import FinancialAnalyzer
 from comprehensive_analyzer import ComprehensiveAnalyzer
 
 # Initialize FastAPI app
-app = FastAPI(title="Financial Research Agent", description="Advanced Stock Analysis Tool")
+app = FastAPI(
+    title="Financial Research Agent",
+    description="Advanced Stock Analysis Tool",
+    default_response_class=ORJSONResponse
+)
+
+class SelectiveGZipMiddleware(GZipMiddleware):
+    """GZipMiddleware that passes through routes which encode their own bodies"""
+    
+    def __init__(self, app, exclude_paths=(), **kwargs):
+        super().__init__(app, **kwargs)
+        self.exclude_paths = frozenset(exclude_paths)
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] in self.exclude_paths:
+            return await self.app(scope, receive, send)
+        await super().__call__(scope, receive, send)
+
+# The home page is served pre-compressed; older Starlette releases would gzip it a second time.
+# The NDJSON stream is excluded too, since gzip holds back its sections until the buffer fills
+app.add_middleware(SelectiveGZipMiddleware, minimum_size=500, exclude_paths={"/", "/analyze/stream"})
+
+# Access logging is off; only server errors are logged, through uvicorn's error logger
+logger = logging.getLogger("uvicorn.error")
+
+class ServerErrorLogMiddleware:
+    """Pure ASGI middleware that logs 5xx responses as one orjson line"""
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        
+        async def send_logging_errors(message):
+            if message["type"] == "http.response.start" and message["status"] >= 500:
+                logger.error(orjson.dumps(
+                    {"method": scope["method"], "path": scope["path"], "status": message["status"]}
+                ).decode())
+            await send(message)
+        
+        await self.app(scope, receive, send_logging_errors)
+
+app.add_middleware(ServerErrorLogMiddleware)
+
+# Global analyzer instances, built per worker at startup rather than at import
+analyzer: Optional[FinancialAnalyzer] = None
+comprehensive_analyzer: Optional[ComprehensiveAnalyzer] = None
+
+@app.on_event("startup")
+async def init_analyzers():
+    global analyzer, comprehensive_analyzer
+    analyzer = FinancialAnalyzer()
+    comprehensive_analyzer = ComprehensiveAnalyzer(analyzer)
 
-# Global analyzer instances
-analyzer = FinancialAnalyzer()
-comprehensive_analyzer = ComprehensiveAnalyzer()
+# Dedicated pool for blocking analyzer calls so yfinance I/O never runs on the event loop
+ANALYZER_POOL = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("ANALYZER_WORKERS", 8)),
+    thread_name_prefix="analyzer"
+)
+atexit.register(ANALYZER_POOL.shutdown, wait=False)
+
+# orjson options for payloads that may carry numpy scalars
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+# Shared response cache for /analyze, enabled when redis is installed and REDIS_URL is set
+RESPONSE_CACHE_TTL = int(os.environ.get("RESPONSE_CACHE_TTL", 120))  # seconds
+response_cache = aioredis.from_url(os.environ["REDIS_URL"]) if aioredis and os.environ.get("REDIS_URL") else None
+
+async def _cache_get(key: str) -> Optional[bytes]:
+    """Cached /analyze payload, or None on a miss or when the cache is unavailable"""
+    if response_cache is None:
+        return None
+    try:
+        return await response_cache.get(key)
+    except Exception as e:
+        print(f"Warning: Response cache read failed: {e}")
+        return None
+
+async def _cache_set(key: str, body: bytes) -> None:
+    """Store a serialized /analyze response for RESPONSE_CACHE_TTL seconds"""
+    if response_cache is None:
+        return
+    try:
+        await response_cache.setex(key, RESPONSE_CACHE_TTL, body)
+    except Exception as e:
+        print(f"Warning: Response cache write failed: {e}")
+
+async def _run_blocking(func, *args):
+    """Run a blocking analyzer call in the analyzer pool"""
+    return await asyncio.get_running_loop().run_in_executor(ANALYZER_POOL, func, *args)
+
+async def _gather_analyses(symbol: str, comprehensive: bool):
+    """Run the independent analyzer calls concurrently in the analyzer pool"""
+    tasks = [
+        _run_blocking(analyzer.get_stock_data, symbol),
+        _run_blocking(analyzer.analyze_fundamentals, symbol),
+        _run_blocking(analyzer.analyze_technicals, symbol),
+        _run_blocking(analyzer.analyze_sentiment, symbol),
+    ]
+    if comprehensive:
+        tasks.append(_run_blocking(comprehensive_analyzer.perform_comprehensive_analysis, symbol))
+    
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    
+    # The recommendation needs all of the core results; only the comprehensive add-on may degrade
+    for outcome in results[:4]:
+        if isinstance(outcome, BaseException):
+            raise outcome
+    if not comprehensive:
+        results.append(None)
+    elif isinstance(results[4], BaseException):
+        print(f"Warning: Comprehensive analysis failed for {symbol}: {results[4]}")
+        results[4] = None
+    return results
+
+# Ticker symbols: optional index caret, then up to 10 letters/digits/./-/= (e.g. BRK-B, ^GSPC, EURUSD=X)
+SYMBOL_PATTERN = re.compile(r"\^?[A-Z0-9][A-Z0-9.=\-]{0,9}")
+
+def _validate_symbol(symbol: str) -> str:
+    """Normalize a ticker and reject malformed input before any network call"""
+    symbol = symbol.upper().strip()
+    if not SYMBOL_PATTERN.fullmatch(symbol):
+        raise HTTPException(status_code=400, detail="Invalid ticker symbol")
+    return symbol
 
 class AnalysisRequest(BaseModel):
     symbol: str
@@ -35,362 +179,109 @@ class AnalysisResponse(BaseModel):
     data: Optional[Dict[str, Any]] = None
     error: Optional[str] = None
 
+# Home page: read from templates/, minified and gzip-compressed once at import, revalidated by ETag
+HOME_HTML = (Path(__file__).parent / "templates" / "home.html").read_text(encoding="utf-8")
+# Minify by dropping indentation and blank lines; line breaks stay, so inline JS keeps its semantics
+HOME_HTML_MIN = "\n".join(line.strip() for line in HOME_HTML.splitlines() if line.strip())
+HOME_HTML_BYTES = HOME_HTML_MIN.encode("utf-8")
+HOME_HTML_GZ = gzip.compress(HOME_HTML_BYTES, compresslevel=9)
+HOME_HTML_BR = brotli.compress(HOME_HTML_BYTES, quality=11) if brotli is not None else None
+HOME_ETAG = '"' + hashlib.sha1(HOME_HTML_BYTES).hexdigest() + '"'
+HOME_HEADERS = {"ETag": HOME_ETAG, "Cache-Control": "public, max-age=3600", "Vary": "Accept-Encoding"}
+
 @app.get("/", response_class=HTMLResponse)
 async def home(request: Request):
     """Home page with analysis form"""
-    html_content = """
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>Financial Research Agent</title>
-        <meta charset="utf-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1">
-        <style>
-            body { 
-                font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; 
-                margin: 0; 
-                padding: 20px; 
-                background: #1a1a1a; 
-                color: #e0e0e0; 
-            }
-            .container { 
-                max-width: 1200px; 
-                margin: 0 auto; 
-                background: #2d2d2d; 
-                border-radius: 10px; 
-                padding: 30px; 
-                box-shadow: 0 4px 6px rgba(0,0,0,0.3); 
-            }
-            h1 { 
-                text-align: center; 
-                color: #4CAF50; 
-                margin-bottom: 30px; 
-                font-size: 2.5rem; 
-            }
-            .form-group { 
-                margin-bottom: 20px; 
-            }
-            label { 
-                display: block; 
-                margin-bottom: 5px; 
-                font-weight: bold; 
-                color: #b0b0b0; 
-            }
-            input[type="text"] { 
-                width: 100%; 
-                padding: 12px; 
-                border: 1px solid #555; 
-                border-radius: 5px; 
-                background: #3a3a3a; 
-                color: #e0e0e0; 
-                font-size: 16px; 
-            }
-            .button-group { 
-                display: flex; 
-                gap: 10px; 
-                justify-content: center; 
-                margin: 30px 0; 
-            }
-            button { 
-                padding: 12px 24px; 
-                border: none; 
-                border-radius: 5px; 
-                cursor: pointer; 
-                font-size: 16px; 
-                font-weight: bold; 
-                transition: background-color 0.3s; 
-            }
-            .btn-standard { 
-                background: #2196F3; 
-                color: white; 
-            }
-            .btn-standard:hover { 
-                background: #1976D2; 
-            }
-            .btn-comprehensive { 
-                background: #9C27B0; 
-                color: white; 
-            }
-            .btn-comprehensive:hover { 
-                background: #7B1FA2; 
-            }
-            #loading { 
-                display: none; 
-                text-align: center; 
-                margin: 20px; 
-                color: #4CAF50; 
-            }
-            #results { 
-                margin-top: 30px; 
-                padding: 20px; 
-                background: #3a3a3a; 
-                border-radius: 5px; 
-                border-left: 4px solid #4CAF50; 
-            }
-            .metric-group { 
-                display: grid; 
-                grid-template-columns: repeat(auto-fit, minmax(300px, 1fr)); 
-                gap: 20px; 
-                margin: 20px 0; 
-            }
-            .metric-card { 
-                background: #2d2d2d; 
-                padding: 15px; 
-                border-radius: 8px; 
-                border: 1px solid #555; 
-            }
-            .metric-title { 
-                color: #4CAF50; 
-                font-weight: bold; 
-                margin-bottom: 10px; 
-                font-size: 1.1rem; 
-            }
-            .error { 
-                color: #f44336; 
-                background: #3a1a1a; 
-                padding: 15px; 
-                border-radius: 5px; 
-                margin: 10px 0; 
-                border: 1px solid #f44336; 
-            }
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <h1>🏦 Financial Research Agent</h1>
-            <p style="text-align: center; color: #b0b0b0; margin-bottom: 30px;">
-                Advanced Stock Analysis with Fundamental, Technical, and Sentiment Analysis
-            </p>
-            
-            <form id="analysisForm">
-                <div class="form-group">
-                    <label for="symbol">Stock Ticker Symbol:</label>
-                    <input type="text" id="symbol" name="symbol" placeholder="e.g., AAPL, MSFT, TSLA" required>
-                </div>
-                
-                <div class="button-group">
-                    <button type="button" class="btn-standard" onclick="analyzeStock('standard')">
-                        📈 Standard Analysis
-                    </button>
-                    <button type="button" class="btn-comprehensive" onclick="analyzeStock('comprehensive')">
-                        🔬 Comprehensive Analysis
-                    </button>
-                </div>
-            </form>
-            
-            <div id="loading">
-                <p>⏳ Analyzing stock... This may take a few moments.</p>
-                <div style="margin: 20px;">
-                    <div style="display: inline-block; width: 300px; height: 4px; background: #555; border-radius: 2px;">
-                        <div style="width: 0%; height: 100%; background: #4CAF50; border-radius: 2px; animation: loading 3s ease-in-out infinite;" id="progressBar"></div>
-                    </div>
-                </div>
-            </div>
-            
-            <div id="results" style="display: none;"></div>
-        </div>
-        
-        <style>
-            @keyframes loading {
-                0% { width: 0%; }
-                50% { width: 70%; }
-                100% { width: 100%; }
-            }
-        </style>
-        
-        <script>
-            async function analyzeStock(mode) {
-                const symbol = document.getElementById('symbol').value.trim().toUpperCase();
-                if (!symbol) {
-                    alert('Please enter a stock ticker symbol');
-                    return;
-                }
-                
-                document.getElementById('loading').style.display = 'block';
-                document.getElementById('results').style.display = 'none';
-                
-                try {
-                    const response = await fetch('/analyze', {
-                        method: 'POST',
-                        headers: {
-                            'Content-Type': 'application/json',
-                        },
-                        body: JSON.stringify({
-                            symbol: symbol,
-                            analysis_mode: mode
-                        })
-                    });
-                    
-                    const data = await response.json();
-                    document.getElementById('loading').style.display = 'none';
-                    displayResults(data);
-                    
-                } catch (error) {
-                    document.getElementById('loading').style.display = 'none';
-                    document.getElementById('results').innerHTML = 
-                        `<div class="error">Error: ${error.message}</div>`;
-                    document.getElementById('results').style.display = 'block';
-                }
-            }
-            
-            function displayResults(data) {
-                const resultsDiv = document.getElementById('results');
-                if (data.status === 'error') {
-                    resultsDiv.innerHTML = `<div class="error">Error: ${data.error}</div>`;
-                    resultsDiv.style.display = 'block';
-                    return;
-                }
-                
-                const result = data.data;
-                let html = `
-                    <h2>Analysis Results for ${result.symbol}</h2>
-                    
-                    <div class="metric-group">
-                        <div class="metric-card">
-                            <div class="metric-title">Stock Overview</div>
-                            <p><strong>Company:</strong> ${result.name || 'N/A'}</p>
-                            <p><strong>Current Price:</strong> $${result.current_price || 'N/A'}</p>
-                            <p><strong>Change:</strong> ${result.change_percent ? (result.change_percent >= 0 ? '+' : '') + result.change_percent.toFixed(2) + '%' : 'N/A'}</p>
-                        </div>
-                        
-                        <div class="metric-card">
-                            <div class="metric-title">Recommendation</div>
-                            <p><strong>Action:</strong> <span style="color: ${getRecommendationColor(result.recommendation?.action)}">${result.recommendation?.action || 'N/A'}</span></p>
-                            <p><strong>Confidence:</strong> ${result.recommendation?.confidence || 'N/A'}%</p>
-                            <p><strong>Risk Level:</strong> ${result.recommendation?.risk_level || 'N/A'}</p>
-                            ${result.recommendation?.price_target ? `<p><strong>Price Target:</strong> $${result.recommendation.price_target}</p>` : ''}
-                        </div>
-                    </div>
-                `;
-                
-                if (result.fundamentals) {
-                    html += `
-                        <div class="metric-card">
-                            <div class="metric-title">Fundamental Analysis</div>
-                            <p><strong>P/E Ratio:</strong> ${result.fundamentals.pe_ratio?.toFixed(2) || 'N/A'}</p>
-                            <p><strong>ROE:</strong> ${result.fundamentals.roe?.toFixed(1) || 'N/A'}%</p>
-                            <p><strong>Profit Margin:</strong> ${result.fundamentals.profit_margin?.toFixed(1) || 'N/A'}%</p>
-                            <p><strong>Debt/Equity:</strong> ${result.fundamentals.debt_to_equity?.toFixed(2) || 'N/A'}</p>
-                            <p><strong>Score:</strong> ${result.fundamentals.score?.toFixed(1) || 'N/A'}/100</p>
-                        </div>
-                    `;
-                }
-                
-                if (result.technicals) {
-                    html += `
-                        <div class="metric-card">
-                            <div class="metric-title">Technical Analysis</div>
-                            <p><strong>RSI (14):</strong> ${result.technicals.rsi?.toFixed(1) || 'N/A'}</p>
-                            <p><strong>MACD:</strong> ${result.technicals.macd?.toFixed(4) || 'N/A'}</p>
-                            <p><strong>SMA 20:</strong> $${result.technicals.sma_20?.toFixed(2) || 'N/A'}</p>
-                            <p><strong>Trend:</strong> ${result.technicals.trend || 'N/A'}</p>
-                            <p><strong>Score:</strong> ${result.technicals.score?.toFixed(1) || 'N/A'}/100</p>
-                        </div>
-                    `;
-                }
-                
-                if (result.sentiment) {
-                    html += `
-                        <div class="metric-card">
-                            <div class="metric-title">Sentiment Analysis</div>
-                            <p><strong>Analyst Rating:</strong> ${result.sentiment.analyst_rating || 'N/A'}</p>
-                            <p><strong>News Sentiment:</strong> ${result.sentiment.news_sentiment?.toFixed(1) || 'N/A'}/100</p>
-                            <p><strong>Social Sentiment:</strong> ${result.sentiment.social_sentiment?.toFixed(1) || 'N/A'}/100</p>
-                            <p><strong>Score:</strong> ${result.sentiment.score?.toFixed(1) || 'N/A'}/100</p>
-                        </div>
-                    `;
-                }
-                
-                if (result.comprehensive_analysis) {
-                    html += `
-                        <div class="metric-card">
-                            <div class="metric-title">🔬 Comprehensive Analysis</div>
-                            <p><strong>Composite Score:</strong> ${result.comprehensive_analysis.composite_score?.toFixed(1) || 'N/A'}/100</p>
-                            <p><strong>Confidence Level:</strong> ${(result.comprehensive_analysis.confidence_level * 100)?.toFixed(1) || 'N/A'}%</p>
-                            ${result.comprehensive_analysis.financial_health?.piotroski_score ? `<p><strong>Piotroski Score:</strong> ${result.comprehensive_analysis.financial_health.piotroski_score}/9</p>` : ''}
-                            ${result.comprehensive_analysis.financial_health?.altman_z_score ? `<p><strong>Altman Z-Score:</strong> ${result.comprehensive_analysis.financial_health.altman_z_score.toFixed(2)}</p>` : ''}
-                        </div>
-                    `;
-                }
-                
-                resultsDiv.innerHTML = html;
-                resultsDiv.style.display = 'block';
-            }
-            
-            function getRecommendationColor(action) {
-                const colors = {
-                    'STRONG_BUY': '#4CAF50',
-                    'BUY': '#8BC34A',
-                    'HOLD': '#FF9800',
-                    'SELL': '#FF5722',
-                    'STRONG_SELL': '#f44336'
-                };
-                return colors[action] || '#e0e0e0';
-            }
-            
-            // Allow Enter key to submit
-            document.getElementById('symbol').addEventListener('keypress', function(e) {
-                if (e.key === 'Enter') {
-                    analyzeStock('standard');
-                }
-            });
-        </script>
-    </body>
-    </html>
-    """
-    return HTMLResponse(content=html_content)
+    if request.headers.get("if-none-match") == HOME_ETAG:
+        return Response(status_code=304, headers=HOME_HEADERS)
+    accept_encoding = request.headers.get("accept-encoding", "")
+    if HOME_HTML_BR is not None and "br" in accept_encoding:
+        return Response(content=HOME_HTML_BR, media_type="text/html; charset=utf-8",
+                        headers={**HOME_HEADERS, "Content-Encoding": "br"})
+    if "gzip" in accept_encoding:
+        return Response(content=HOME_HTML_GZ, media_type="text/html; charset=utf-8",
+                        headers={**HOME_HEADERS, "Content-Encoding": "gzip"})
+    return Response(content=HOME_HTML_BYTES, media_type="text/html; charset=utf-8", headers=HOME_HEADERS)
+
+async def _analysis_body(symbol: str, comprehensive: bool, cache_key: str) -> bytes:
+    """Run the analysis for one symbol and serialize the success response"""
+    # Perform analysis: independent calls fan out, the recommendation waits on their results
+    stock_data, fundamentals, technicals, sentiment, comprehensive_analysis = await _gather_analyses(
+        symbol, comprehensive
+    )
+    recommendation = await _run_blocking(analyzer.generate_recommendation, stock_data, fundamentals, technicals, sentiment)
+    
+    if comprehensive:
+        # Comprehensive analysis
+        result = {
+            "symbol": stock_data.symbol,
+            "name": stock_data.name,
+            "current_price": stock_data.current_price,
+            "change_percent": stock_data.change_percent,
+            "fundamentals": fundamentals,
+            "technicals": technicals,
+            "sentiment": sentiment,
+            "comprehensive_analysis": comprehensive_analysis,
+            "recommendation": recommendation
+        }
+    else:
+        # Standard analysis
+        result = {
+            "symbol": stock_data.symbol,
+            "name": stock_data.name,
+            "current_price": stock_data.current_price,
+            "change_percent": stock_data.change_percent,
+            "fundamentals": fundamentals,
+            "technicals": technicals,
+            "sentiment": sentiment,
+            "recommendation": recommendation
+        }
+    
+    # Analyzer dataclasses go straight to orjson; no intermediate dict copies or model validation
+    body = orjson.dumps(
+        {"symbol": symbol, "status": "success", "data": result, "error": None},
+        default=str, option=ORJSON_OPTIONS
+    )
+    await _cache_set(cache_key, body)
+    return body
+
+# In-flight /analyze work by cache key, so concurrent requests for one (mode, symbol) share a single run
+_inflight: Dict[str, asyncio.Future] = {}
+
+def _release_inflight(cache_key: str, future: asyncio.Future) -> None:
+    """Forget a finished run; its outcome has been delivered to every waiter"""
+    _inflight.pop(cache_key, None)
+    if not future.cancelled():
+        future.exception()  # Mark retrieved even if every waiter disconnected
+
+def _response_cache_key(symbol: str, comprehensive: bool) -> str:
+    return f"fra:{'comprehensive' if comprehensive else 'standard'}:{symbol}"
+
+def _start_analysis(symbol: str, comprehensive: bool, cache_key: str) -> asyncio.Future:
+    """Join the in-flight run for cache_key, starting one if there is none"""
+    future = _inflight.get(cache_key)
+    if future is None:
+        future = asyncio.ensure_future(_analysis_body(symbol, comprehensive, cache_key))
+        _inflight[cache_key] = future
+        future.add_done_callback(lambda done: _release_inflight(cache_key, done))
+    return future
 
 @app.post("/analyze", response_model=AnalysisResponse)
 async def analyze_stock(request: AnalysisRequest, background_tasks: BackgroundTasks):
     """Analyze a stock symbol"""
+    symbol = _validate_symbol(request.symbol)
+    
     try:
-        symbol = request.symbol.upper().strip()
+        comprehensive = request.analysis_mode == "comprehensive"
         
-        # Perform analysis
-        if request.analysis_mode == "comprehensive":
-            # Comprehensive analysis
-            stock_data = analyzer.get_stock_data(symbol)
-            fundamentals = analyzer.analyze_fundamentals(symbol)
-            technicals = analyzer.analyze_technicals(symbol)
-            sentiment = analyzer.analyze_sentiment(symbol)
-            comprehensive_analysis = comprehensive_analyzer.perform_comprehensive_analysis(symbol)
-            recommendation = analyzer.generate_recommendation(symbol, fundamentals, technicals, sentiment)
-            
-            result = {
-                "symbol": stock_data.symbol,
-                "name": stock_data.name,
-                "current_price": stock_data.current_price,
-                "change_percent": stock_data.change_percent,
-                "fundamentals": fundamentals.__dict__ if fundamentals else None,
-                "technicals": technicals.__dict__ if technicals else None,
-                "sentiment": sentiment.__dict__ if sentiment else None,
-                "comprehensive_analysis": comprehensive_analysis.__dict__ if comprehensive_analysis else None,
-                "recommendation": recommendation.__dict__ if recommendation else None
-            }
-        else:
-            # Standard analysis
-            stock_data = analyzer.get_stock_data(symbol)
-            fundamentals = analyzer.analyze_fundamentals(symbol)
-            technicals = analyzer.analyze_technicals(symbol)
-            sentiment = analyzer.analyze_sentiment(symbol)
-            recommendation = analyzer.generate_recommendation(symbol, fundamentals, technicals, sentiment)
-            
-            result = {
-                "symbol": stock_data.symbol,
-                "name": stock_data.name,
-                "current_price": stock_data.current_price,
-                "change_percent": stock_data.change_percent,
-                "fundamentals": fundamentals.__dict__ if fundamentals else None,
-                "technicals": technicals.__dict__ if technicals else None,
-                "sentiment": sentiment.__dict__ if sentiment else None,
-                "recommendation": recommendation.__dict__ if recommendation else None
-            }
+        cache_key = _response_cache_key(symbol, comprehensive)
+        cached = await _cache_get(cache_key)
+        if cached is not None:
+            return Response(content=cached, media_type="application/json", headers={"X-Cache": "HIT"})
         
-        return AnalysisResponse(
-            symbol=symbol,
-            status="success",
-            data=result
-        )
+        # Shielded so one client disconnecting does not cancel the run the others are waiting on
+        body = await asyncio.shield(_start_analysis(symbol, comprehensive, cache_key))
+        return Response(content=body, media_type="application/json", headers={"X-Cache": "MISS"})
         
     except Exception as e:
         return AnalysisResponse(
@@ -399,15 +290,146 @@ async def analyze_stock(request: AnalysisRequest, background_tasks: BackgroundTa
             error=str(e)
         )
 
+async def _optional_section(symbol: str, section):
+    """Await a section whose failure should not abort the rest of the analysis"""
+    try:
+        return await section
+    except Exception as e:
+        print(f"Warning: Comprehensive analysis failed for {symbol}: {e}")
+        return None
+
+async def _stream_analysis(symbol: str, comprehensive: bool):
+    """Yield one NDJSON line per analysis section, in the order the sections finish"""
+    loop = asyncio.get_running_loop()
+    sections = {
+        "stock_data": loop.create_task(_run_blocking(analyzer.get_stock_data, symbol)),
+        "fundamentals": loop.create_task(_run_blocking(analyzer.analyze_fundamentals, symbol)),
+        "technicals": loop.create_task(_run_blocking(analyzer.analyze_technicals, symbol)),
+        "sentiment": loop.create_task(_run_blocking(analyzer.analyze_sentiment, symbol)),
+    }
+    
+    async def recommend():
+        # Depends on the quote and the three scored sections
+        results = await asyncio.gather(
+            sections["stock_data"], sections["fundamentals"], sections["technicals"], sections["sentiment"]
+        )
+        return await _run_blocking(analyzer.generate_recommendation, *results)
+    
+    sections["recommendation"] = loop.create_task(recommend())
+    if comprehensive:
+        sections["comprehensive_analysis"] = loop.create_task(_optional_section(
+            symbol, _run_blocking(comprehensive_analyzer.perform_comprehensive_analysis, symbol)
+        ))
+    
+    names = {task: name for name, task in sections.items()}
+    pending = set(names)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield orjson.dumps(
+                    {"part": names[task], "data": task.result()}, default=str, option=ORJSON_OPTIONS
+                ) + b"\n"
+    except Exception as e:
+        # Headers are already sent, so report the failure as the final line
+        yield orjson.dumps({"part": "error", "error": str(e)}) + b"\n"
+    finally:
+        # Stop unfinished sections and mark failed ones as handled
+        for task in names:
+            if not task.done():
+                task.cancel()
+            elif not task.cancelled():
+                task.exception()
+
+@app.post("/analyze/stream")
+async def analyze_stock_stream(request: AnalysisRequest):
+    """Analyze a stock symbol, streaming each section as soon as it is ready"""
+    symbol = _validate_symbol(request.symbol)
+    return StreamingResponse(
+        _stream_analysis(symbol, request.analysis_mode == "comprehensive"),
+        media_type="application/x-ndjson"
+    )
+
+# Popular tickers kept warm in the caches so their first request of the minute skips the cold path
+WARM_SYMBOLS = ["AAPL", "MSFT", "GOOGL", "AMZN", "NVDA", "TSLA", "META", "SPY"]
+WARM_INTERVAL = int(os.environ.get("WARM_INTERVAL", 0))  # seconds, 0 (default) disables
+WARM_CONCURRENCY = 2  # symbols at a time, so warm-up leaves most of ANALYZER_POOL to users
+WARM_LOCK_FILE = Path(tempfile.gettempdir()) / "financial_agent_warm.lock"
+_warm_task: Optional[asyncio.Task] = None
+_warm_lock = None  # Open lock file held by the one worker that runs warm-up
+
+def _acquire_warm_lock() -> bool:
+    """Take the host-wide warm-up leader lock without blocking; only one worker gets it"""
+    global _warm_lock
+    if fcntl is None:
+        return int(os.environ.get("WEB_CONCURRENCY", 1)) <= 1
+    lock = open(WARM_LOCK_FILE, "w")
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock.close()
+        return False
+    _warm_lock = lock  # Released by the OS when this worker exits
+    return True
+
+async def _warm_symbol(symbol: str, slots: asyncio.Semaphore) -> bool:
+    # Only the quote and price history stages: they refresh the shared on-disk market data
+    # cache without spending NewsAPI/Reddit quota on sentiment
+    async with slots:
+        try:
+            await asyncio.gather(
+                _run_blocking(analyzer.get_stock_data, symbol),
+                _run_blocking(analyzer.analyze_technicals, symbol),
+            )
+            return True
+        except Exception as e:
+            print(f"Warning: Warm-up failed for {symbol}: {e}")
+            return False
+
+async def _warm_pass() -> int:
+    """Refresh every warm symbol once; returns how many succeeded"""
+    slots = asyncio.Semaphore(WARM_CONCURRENCY)
+    return sum(await asyncio.gather(*[_warm_symbol(symbol, slots) for symbol in WARM_SYMBOLS]))
+
+async def _warm_loop() -> None:
+    while True:
+        await _warm_pass()
+        await asyncio.sleep(WARM_INTERVAL)
+
+@app.on_event("startup")
+async def start_warm_up():
+    global _warm_task
+    if WARM_INTERVAL > 0 and _acquire_warm_lock():
+        _warm_task = asyncio.create_task(_warm_loop())
+
+@app.on_event("shutdown")
+async def stop_warm_up():
+    if _warm_task is not None:
+        _warm_task.cancel()
+
+# Health responses are constant, so build them once and hand out the same objects
+HEALTH_BODY = b'{"status":"healthy","service":"Financial Research Agent"}'
+HEALTH_ETAG = '"' + hashlib.sha1(HEALTH_BODY).hexdigest() + '"'
+HEALTH_RESPONSE = Response(content=HEALTH_BODY, media_type="application/json",
+                           headers={"ETag": HEALTH_ETAG, "Cache-Control": "no-cache"})
+HEALTH_NOT_MODIFIED = Response(status_code=304, headers={"ETag": HEALTH_ETAG, "Cache-Control": "no-cache"})
+
 @app.get("/health")
-async def health_check():
+async def health_check(request: Request):
     """Health check endpoint for Railway"""
-    return {"status": "healthy", "service": "Financial Research Agent"}
+    if request.headers.get("if-none-match") == HEALTH_ETAG:
+        return HEALTH_NOT_MODIFIED
+    return HEALTH_RESPONSE
 
 if __name__ == "__main__":
     import uvicorn
     port = int(os.environ.get("PORT", 8000))
     host = os.environ.get("HOST", "0.0.0.0")
     
-    print(f"Starting Financial Research Agent web server on {host}:{port}")
-    uvicorn.run(app, host=host, port=port)
\ No newline at end of file
+    # uvloop/httptools ship with uvicorn[standard]; each worker imports the app and builds its own analyzers
+    # Capped: every worker carries its own analyzer pool and caches
+    workers = int(os.environ.get("WEB_CONCURRENCY", min(os.cpu_count() or 1, 4)))
+    
+    print(f"Starting Financial Research Agent web server on {host}:{port} with {workers} workers")
+    uvicorn.run("fastapi_web:app", host=host, port=port, loop="uvloop", http="httptools",
+                workers=workers, access_log=False)
\ No newline at end of file
@@ -5,13 +5,225 @@ import yfinance as yf
 import pandas as pd
 import numpy as np
 import requests
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
+from threading import Lock
+from concurrent.futures import Future, ThreadPoolExecutor
+import bisect
 import json
+import math
 
+from cachetools import TTLCache
 
-@dataclass
+from config import config_manager
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Company metadata barely changes, so profiles are kept far longer than quotes
+PROFILE_CACHE_TTL = 24 * 60 * 60  # seconds
+# Tickers, info dicts and price history are shared by the analyze_* calls of one pipeline run
+MARKET_DATA_CACHE_TTL = 60  # seconds
+
+
+def _technical_indicators_loop(close: np.ndarray, rsi_period: int = 14) -> Tuple[float, ...]:
+    """Final SMA 20/50/200, Bollinger bands, RSI, MACD/signal and 20-day high/low in one pass
+
+    Matches pandas rolling means/std (ddof=1), adjusted ewm spans 12/26/9 and Wilder RSI;
+    anything without enough history comes back as nan.
+    """
+    n = close.shape[0]
+    sum_20 = 0.0
+    sum_50 = 0.0
+    sum_200 = 0.0
+    high_20 = -np.inf
+    low_20 = np.inf
+    
+    # Adjusted EMAs as weighted numerator/denominator pairs, like pandas ewm(adjust=True)
+    decay_12 = 1.0 - 2.0 / 13.0
+    decay_26 = 1.0 - 2.0 / 27.0
+    decay_9 = 1.0 - 2.0 / 10.0
+    num_12 = den_12 = num_26 = den_26 = num_9 = den_9 = 0.0
+    macd = np.nan
+    
+    avg_gain = 0.0
+    avg_loss = 0.0
+    
+    for i in range(n):
+        price = close[i]
+        if i >= n - 200:
+            sum_200 += price
+            if i >= n - 50:
+                sum_50 += price
+                if i >= n - 20:
+                    sum_20 += price
+                    high_20 = max(high_20, price)
+                    low_20 = min(low_20, price)
+        
+        num_12 = price + decay_12 * num_12
+        den_12 = 1.0 + decay_12 * den_12
+        num_26 = price + decay_26 * num_26
+        den_26 = 1.0 + decay_26 * den_26
+        macd = num_12 / den_12 - num_26 / den_26
+        num_9 = macd + decay_9 * num_9
+        den_9 = 1.0 + decay_9 * den_9
+        
+        if i > 0:
+            change = price - close[i - 1]
+            gain = change if change > 0 else 0.0
+            loss = -change if change < 0 else 0.0
+            if i <= rsi_period:
+                avg_gain += gain / rsi_period
+                avg_loss += loss / rsi_period
+            else:
+                avg_gain = (avg_gain * (rsi_period - 1) + gain) / rsi_period
+                avg_loss = (avg_loss * (rsi_period - 1) + loss) / rsi_period
+    
+    sma_20 = sum_20 / 20 if n >= 20 else np.nan
+    sma_50 = sum_50 / 50 if n >= 50 else np.nan
+    sma_200 = sum_200 / 200 if n >= 200 else np.nan
+    
+    bb_upper = np.nan
+    bb_lower = np.nan
+    if n >= 20:
+        squares = 0.0
+        for i in range(n - 20, n):
+            squares += (close[i] - sma_20) ** 2
+        band = 2.0 * np.sqrt(squares / 19)
+        bb_upper = sma_20 + band
+        bb_lower = sma_20 - band
+    
+    rsi = np.nan
+    if n > rsi_period:
+        rsi = 100.0 if avg_loss == 0.0 else 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    
+    macd_signal = num_9 / den_9 if n > 0 else np.nan
+    return sma_20, sma_50, sma_200, bb_upper, bb_lower, rsi, macd, macd_signal, high_20, low_20
+
+
+_technical_indicators = (njit(cache=True)(_technical_indicators_loop)
+                         if njit is not None else _technical_indicators_loop)
+
+
+# Overall score cut-offs (inclusive lower bounds) and the action for each band
+_ACTION_THRESHOLDS = (20, 35, 65, 80)
+_ACTIONS = ("STRONG_SELL", "SELL", "HOLD", "BUY", "STRONG_BUY")
+
+# Confidence cut-offs (exclusive lower bounds) and the risk level for each band
+_RISK_THRESHOLDS = (60, 80)
+_RISK_LEVELS = ("HIGH", "MEDIUM", "LOW")
+
+# Points added to the technical score for each trend label
+_TREND_SCORES = {
+    "STRONG_BULLISH": 20,
+    "BULLISH": 15,
+    "NEUTRAL": 0,
+    "BEARISH": -15,
+    "STRONG_BEARISH": -20
+}
+
+
+def _metric(value) -> float:
+    """Optional metric as a float for the scoring kernels (missing or zero -> NaN)"""
+    if value is None or value == 0:
+        return math.nan
+    return float(value)
+
+
+def _fundamental_score_py(pe_ratio: float, roe: float, debt_to_equity: float, revenue_growth: float) -> float:
+    """Fundamental analysis score (0-100); NaN inputs are skipped"""
+    score = 50.0  # Base score
+    
+    # P/E ratio scoring
+    if not math.isnan(pe_ratio):
+        if pe_ratio < 15:
+            score += 10
+        elif pe_ratio < 25:
+            score += 5
+        elif pe_ratio > 40:
+            score -= 10
+    
+    # ROE scoring
+    if not math.isnan(roe):
+        if roe > 20:
+            score += 15
+        elif roe > 15:
+            score += 10
+        elif roe > 10:
+            score += 5
+        elif roe < 5:
+            score -= 10
+    
+    # Debt-to-equity scoring
+    if not math.isnan(debt_to_equity):
+        if debt_to_equity < 0.3:
+            score += 10
+        elif debt_to_equity < 0.6:
+            score += 5
+        elif debt_to_equity > 1.0:
+            score -= 10
+    
+    # Revenue growth scoring
+    if not math.isnan(revenue_growth):
+        if revenue_growth > 20:
+            score += 15
+        elif revenue_growth > 10:
+            score += 10
+        elif revenue_growth > 5:
+            score += 5
+        elif revenue_growth < 0:
+            score -= 10
+    
+    return max(0.0, min(100.0, score))
+
+
+def _technical_score_py(rsi: float, trend_points: float, macd: float, macd_signal: float,
+                        current_price: float, sma_20: float, sma_50: float) -> float:
+    """Technical analysis score (0-100); NaN inputs are skipped"""
+    score = 50.0 + trend_points  # Base score plus trend scoring
+    
+    # RSI scoring
+    if not math.isnan(rsi):
+        if 40 <= rsi <= 60:
+            score += 10  # Neutral zone
+        elif 30 <= rsi <= 40:
+            score += 5   # Slightly oversold
+        elif rsi < 30:
+            score += 15  # Oversold (buy signal)
+        elif 60 <= rsi <= 70:
+            score += 5   # Slightly overbought
+        elif rsi > 70:
+            score -= 10  # Overbought (sell signal)
+    
+    # MACD scoring
+    if not (math.isnan(macd) or math.isnan(macd_signal)):
+        if macd > macd_signal:
+            score += 10  # Bullish crossover
+        else:
+            score -= 5   # Bearish crossover
+    
+    # Moving average scoring
+    if not (math.isnan(sma_20) or math.isnan(sma_50)):
+        if current_price > sma_20 > sma_50:
+            score += 10
+        elif current_price < sma_20 < sma_50:
+            score -= 10
+    
+    return max(0.0, min(100.0, score))
+
+
+if njit is not None:
+    _fundamental_score = njit(cache=True)(_fundamental_score_py)
+    _technical_score = njit(cache=True)(_technical_score_py)
+else:
+    _fundamental_score = _fundamental_score_py
+    _technical_score = _technical_score_py
+
+
+@dataclass(slots=True)
 class StockData:
     """Core stock data structure"""
     symbol: str
@@ -22,7 +234,7 @@ class StockData:
     volume: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class FundamentalMetrics:
     """Fundamental analysis metrics"""
     pe_ratio: Optional[float] = None
@@ -40,7 +252,7 @@ class FundamentalMetrics:
     score: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class TechnicalMetrics:
     """Technical analysis metrics"""
     rsi: Optional[float] = None
@@ -57,7 +269,7 @@ class TechnicalMetrics:
     score: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class SentimentMetrics:
     """Sentiment analysis metrics"""
     news_sentiment: Optional[float] = None
@@ -72,7 +284,7 @@ class SentimentMetrics:
     score: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class Recommendation:
     """Final recommendation with confidence"""
     action: str  # BUY, SELL, HOLD, STRONG_BUY, STRONG_SELL
@@ -103,24 +315,194 @@ class FinancialAnalyzer:
             'macd': 0.25,
             'moving_averages': 0.25
         }
+        
+        # symbol -> profile dict; analyzers are shared across threads, so guard the cache
+        self._profile_cache = TTLCache(maxsize=4096, ttl=PROFILE_CACHE_TTL)
+        self._profile_lock = Lock()
+        
+        # symbol -> yf.Ticker / info dict, (symbol, period) -> history frame,
+        # (symbol, statement) -> financial statement frame
+        self._ticker_cache = TTLCache(maxsize=1024, ttl=MARKET_DATA_CACHE_TTL)
+        self._info_cache = TTLCache(maxsize=1024, ttl=MARKET_DATA_CACHE_TTL)
+        self._hist_cache = TTLCache(maxsize=4096, ttl=MARKET_DATA_CACHE_TTL)
+        self._statement_cache = TTLCache(maxsize=1024, ttl=MARKET_DATA_CACHE_TTL)
+        self._market_lock = Lock()
+        # ('info', symbol) / ('history', symbol, period) / ('statement', symbol, statement)
+        # -> Future of the fetch in progress
+        self._inflight: Dict[tuple, Future] = {}
+    
+    def get_ticker(self, symbol: str) -> yf.Ticker:
+        """Cached yf.Ticker for a symbol"""
+        key = symbol.upper()
+        with self._market_lock:
+            ticker = self._ticker_cache.get(key)
+        if ticker is None:
+            ticker = yf.Ticker(symbol)
+            with self._market_lock:
+                ticker = self._ticker_cache.setdefault(key, ticker)
+        return ticker
+    
+    def _single_flight(self, key: tuple, load):
+        """Run load() once for concurrent callers with the same key; the others wait for its result"""
+        with self._market_lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+        if not leader:
+            return future.result()
+        
+        try:
+            result = load()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._market_lock:
+                del self._inflight[key]
+    
+    def get_info(self, symbol: str) -> dict:
+        """Cached ticker info dict (treat as read-only)"""
+        key = symbol.upper()
+        with self._market_lock:
+            info = self._info_cache.get(key)
+        if info is not None:
+            return info
+        
+        def load() -> dict:
+            info = config_manager.load_pickle(f"{key}_info")
+            if info is None:
+                info = self.get_ticker(symbol).info
+                if not info:
+                    # Don't pin an empty upstream response for the TTL
+                    return info
+                config_manager.store_pickle(f"{key}_info", info)
+            with self._market_lock:
+                self._info_cache[key] = info
+            return info
+        
+        return self._single_flight(('info', key), load)
+    
+    def get_history(self, symbol: str, period: str) -> pd.DataFrame:
+        """Cached price history for a symbol and period (treat as read-only)"""
+        key = (symbol.upper(), period)
+        with self._market_lock:
+            hist = self._hist_cache.get(key)
+        if hist is not None:
+            return hist
+        
+        def load() -> pd.DataFrame:
+            hist = config_manager.load_pickle(f"{key[0]}_history_{period}")
+            if hist is None:
+                hist = self.get_ticker(symbol).history(period=period)
+                if hist.empty:
+                    return hist
+                config_manager.store_pickle(f"{key[0]}_history_{period}", hist)
+            with self._market_lock:
+                self._hist_cache[key] = hist
+            return hist
+        
+        return self._single_flight(('history',) + key, load)
+    
+    def get_statement(self, symbol: str, statement: str = 'financials') -> pd.DataFrame:
+        """Cached financial statement: financials, balance_sheet or cashflow (treat as read-only)"""
+        key = (symbol.upper(), statement)
+        with self._market_lock:
+            frame = self._statement_cache.get(key)
+        if frame is not None:
+            return frame
+        
+        def load() -> pd.DataFrame:
+            frame = config_manager.load_pickle(f"{key[0]}_{statement}")
+            if frame is None:
+                frame = getattr(self.get_ticker(symbol), statement)
+                if frame is None or frame.empty:
+                    return frame
+                config_manager.store_pickle(f"{key[0]}_{statement}", frame)
+            with self._market_lock:
+                self._statement_cache[key] = frame
+            return frame
+        
+        return self._single_flight(('statement',) + key, load)
+    
+    def prefetch_history(self, symbols: List[str], period: str) -> None:
+        """Seed the history cache for several symbols with one batched download"""
+        try:
+            batch = yf.download(symbols, period=period, group_by="ticker",
+                                threads=True, auto_adjust=True, progress=False)
+            tickers = set(batch.columns.get_level_values(0))
+            for symbol in symbols:
+                if symbol in tickers:
+                    hist = batch[symbol].dropna(how="all")
+                    config_manager.store_pickle(f"{symbol}_history_{period}", hist)
+                    with self._market_lock:
+                        self._hist_cache[(symbol, period)] = hist
+        except Exception as e:
+            print(f"Warning: Batch history download failed, fetching per symbol: {e}")
+    
+    def _map_symbols(self, func, symbols: List[str]) -> list:
+        """Apply func to each symbol in a small thread pool, returning results or exceptions"""
+        def call(symbol: str):
+            try:
+                return func(symbol)
+            except Exception as e:
+                return e
+        
+        with ThreadPoolExecutor(max_workers=min(8, len(symbols)), thread_name_prefix="analyze-many") as pool:
+            return list(pool.map(call, symbols))
+    
+    def clear_cache(self) -> None:
+        """Drop the in-memory tickers, info, history, statements and profiles (disk entries go with config_manager.clear_cache)"""
+        with self._market_lock:
+            self._ticker_cache.clear()
+            self._info_cache.clear()
+            self._hist_cache.clear()
+            self._statement_cache.clear()
+        with self._profile_lock:
+            self._profile_cache.clear()
+    
+    def _store_profile(self, symbol: str, info: dict) -> Dict[str, Optional[str]]:
+        """Extract and cache the stable metadata from an info dict"""
+        profile = {
+            'name': info.get('longName', symbol),
+            'sector': info.get('sector'),
+            'industry': info.get('industry'),
+            'exchange': info.get('exchange')
+        }
+        with self._profile_lock:
+            self._profile_cache[symbol.upper()] = profile
+        return profile
+    
+    def get_stock_profile(self, symbol: str) -> Dict[str, Optional[str]]:
+        """Company name, sector, industry and exchange, cached for PROFILE_CACHE_TTL"""
+        with self._profile_lock:
+            profile = self._profile_cache.get(symbol.upper())
+        if profile is None:
+            profile = self._store_profile(symbol, self.get_info(symbol))
+        return profile
     
     def get_stock_data(self, symbol: str) -> StockData:
         """Fetch basic stock data"""
         try:
-            ticker = yf.Ticker(symbol)
-            info = ticker.info
-            hist = ticker.history(period="1d")
+            info = self.get_info(symbol)
             
-            if hist.empty:
-                raise ValueError(f"No data found for symbol {symbol}")
+            # The quote already carries the live price; only download a 1d bar when it doesn't
+            current_price = info.get('regularMarketPrice')
+            if current_price is None:
+                hist = self.get_history(symbol, "1d")
+                if hist.empty:
+                    raise ValueError(f"No data found for symbol {symbol}")
+                current_price = hist['Close'].iloc[-1]
             
-            current_price = hist['Close'].iloc[-1]
             prev_close = info.get('previousClose', current_price)
             change_percent = ((current_price - prev_close) / prev_close) * 100
             
             return StockData(
                 symbol=symbol.upper(),
-                name=info.get('longName', symbol),
+                name=self._store_profile(symbol, info)['name'],
                 current_price=round(current_price, 2),
                 change_percent=round(change_percent, 2),
                 market_cap=info.get('marketCap'),
@@ -129,6 +511,20 @@ class FinancialAnalyzer:
         except Exception as e:
             raise ValueError(f"Error fetching data for {symbol}: {str(e)}")
     
+    def get_stock_data_many(self, symbols: List[str]) -> Dict[str, StockData]:
+        """Fetch basic stock data for several symbols concurrently"""
+        symbols = list(dict.fromkeys(symbol.upper() for symbol in symbols))
+        if not symbols:
+            return {}
+        
+        results = {}
+        for symbol, data in zip(symbols, self._map_symbols(self.get_stock_data, symbols)):
+            if isinstance(data, Exception):
+                print(f"Warning: {data}")
+            else:
+                results[symbol] = data
+        return results
+    
     def get_historical_data(self, symbol: str, period: str = "1mo") -> pd.DataFrame:
         """Fetch historical stock price data
         
@@ -140,8 +536,7 @@ class FinancialAnalyzer:
             DataFrame with Date, Open, High, Low, Close, Volume columns
         """
         try:
-            ticker = yf.Ticker(symbol)
-            hist = ticker.history(period=period)
+            hist = self.get_history(symbol, period)
             
             if hist.empty:
                 raise ValueError(f"No historical data found for symbol {symbol}")
@@ -153,59 +548,62 @@ class FinancialAnalyzer:
         except Exception as e:
             raise ValueError(f"Error fetching historical data for {symbol}: {str(e)}")
     
-    def analyze_fundamentals(self, symbol: str) -> FundamentalMetrics:
-        """Perform fundamental analysis"""
-        try:
-            ticker = yf.Ticker(symbol)
-            info = ticker.info
-            
-            # Get financial ratios
-            pe_ratio = info.get('trailingPE')
-            peg_ratio = info.get('pegRatio')
-            pb_ratio = info.get('priceToBook')
-            ps_ratio = info.get('priceToSalesTrailing12Months')
-            ev_ebitda = info.get('enterpriseToEbitda')
-            
-            # Profitability metrics
-            roe = info.get('returnOnEquity')
-            if roe:
-                roe = roe * 100  # Convert to percentage
-            
-            roa = info.get('returnOnAssets')
-            if roa:
-                roa = roa * 100
-                
-            profit_margin = info.get('profitMargins')
-            if profit_margin:
-                profit_margin = profit_margin * 100
-            
-            # Financial health
-            debt_to_equity = info.get('debtToEquity')
-            current_ratio = info.get('currentRatio')
-            
-            # Growth metrics
-            revenue_growth = info.get('revenueGrowth')
-            if revenue_growth:
-                revenue_growth = revenue_growth * 100
-                
-            earnings_growth = info.get('earningsGrowth')
-            if earnings_growth:
-                earnings_growth = earnings_growth * 100
+    def _fundamentals_from_info(self, info: dict) -> FundamentalMetrics:
+        """Unscored fundamental metrics from a ticker info dict"""
+        # Get financial ratios
+        pe_ratio = info.get('trailingPE')
+        peg_ratio = info.get('pegRatio')
+        pb_ratio = info.get('priceToBook')
+        ps_ratio = info.get('priceToSalesTrailing12Months')
+        ev_ebitda = info.get('enterpriseToEbitda')
+        
+        # Profitability metrics
+        roe = info.get('returnOnEquity')
+        if roe:
+            roe = roe * 100  # Convert to percentage
+        
+        roa = info.get('returnOnAssets')
+        if roa:
+            roa = roa * 100
             
-            fundamentals = FundamentalMetrics(
-                pe_ratio=pe_ratio,
-                peg_ratio=peg_ratio,
-                pb_ratio=pb_ratio,
-                ps_ratio=ps_ratio,
-                ev_ebitda=ev_ebitda,
-                roe=roe,
-                roa=roa,
-                profit_margin=profit_margin,
-                debt_to_equity=debt_to_equity,
-                current_ratio=current_ratio,
-                revenue_growth=revenue_growth,
-                earnings_growth=earnings_growth
-            )
+        profit_margin = info.get('profitMargins')
+        if profit_margin:
+            profit_margin = profit_margin * 100
+        
+        # Financial health
+        debt_to_equity = info.get('debtToEquity')
+        current_ratio = info.get('currentRatio')
+        
+        # Growth metrics
+        revenue_growth = info.get('revenueGrowth')
+        if revenue_growth:
+            revenue_growth = revenue_growth * 100
+            
+        earnings_growth = info.get('earningsGrowth')
+        if earnings_growth:
+            earnings_growth = earnings_growth * 100
+        
+        return FundamentalMetrics(
+            pe_ratio=pe_ratio,
+            peg_ratio=peg_ratio,
+            pb_ratio=pb_ratio,
+            ps_ratio=ps_ratio,
+            ev_ebitda=ev_ebitda,
+            roe=roe,
+            roa=roa,
+            profit_margin=profit_margin,
+            debt_to_equity=debt_to_equity,
+            current_ratio=current_ratio,
+            revenue_growth=revenue_growth,
+            earnings_growth=earnings_growth
+        )
+    
+    def analyze_fundamentals(self, symbol: str, info: Optional[dict] = None) -> FundamentalMetrics:
+        """Perform fundamental analysis, optionally from an already fetched info dict"""
+        try:
+            if info is None:
+                info = self.get_info(symbol)
+            fundamentals = self._fundamentals_from_info(info)
             
             # Calculate fundamental score
             fundamentals.score = self._calculate_fundamental_score(fundamentals)
@@ -216,36 +614,41 @@ class FinancialAnalyzer:
             print(f"Error in fundamental analysis: {str(e)}")
             return FundamentalMetrics()
     
+    def analyze_fundamentals_batch(self, symbols: List[str]) -> pd.DataFrame:
+        """Fundamental metrics and scores for several symbols, one row per symbol"""
+        symbols = list(dict.fromkeys(symbol.upper() for symbol in symbols))
+        columns = [f.name for f in fields(FundamentalMetrics) if f.name != 'score']
+        infos = self._map_symbols(self.get_info, symbols) if symbols else []
+        
+        rows = {}
+        for symbol, info in zip(symbols, infos):
+            if isinstance(info, Exception):
+                print(f"Error in fundamental analysis for {symbol}: {info}")
+            else:
+                metrics = self._fundamentals_from_info(info)
+                rows[symbol] = [getattr(metrics, name) for name in columns]
+        
+        # Struct-of-arrays layout: each metric is one contiguous float column
+        panel = pd.DataFrame.from_dict(rows, orient='index', columns=columns).astype(np.float64)
+        panel['score'] = self._score_fundamentals_vec(panel)
+        return panel
+    
     def analyze_technicals(self, symbol: str) -> TechnicalMetrics:
         """Perform technical analysis"""
         try:
-            ticker = yf.Ticker(symbol)
-            hist = ticker.history(period="6mo")
+            hist = self.get_history(symbol, "6mo")
             
             if len(hist) < 50:
                 raise ValueError("Insufficient historical data for technical analysis")
             
-            # Calculate technical indicators
-            close = hist['Close']
+            # Moving averages, RSI, MACD, Bollinger Bands and support/resistance (simplified) in one pass
+            close = hist['Close'].to_numpy(dtype=np.float64, na_value=np.nan)
+            (sma_20, sma_50, sma_200, bb_upper, bb_lower, rsi, macd, macd_signal,
+             recent_high, recent_low) = _technical_indicators(close)
+            if np.isnan(sma_200):
+                sma_200 = None
             
-            # Moving averages
-            sma_20 = close.rolling(window=20).mean().iloc[-1]
-            sma_50 = close.rolling(window=50).mean().iloc[-1]
-            sma_200 = close.rolling(window=200).mean().iloc[-1] if len(close) >= 200 else None
-            
-            # RSI calculation
-            rsi = self._calculate_rsi(close)
-            
-            # MACD calculation
-            macd, macd_signal = self._calculate_macd(close)
-            
-            # Bollinger Bands
-            bb_upper, bb_lower = self._calculate_bollinger_bands(close)
-            
-            # Support and Resistance (simplified)
-            current_price = close.iloc[-1]
-            recent_high = close.tail(20).max()
-            recent_low = close.tail(20).min()
+            current_price = close[-1]
             
             # Trend determination
             trend = self._determine_trend(current_price, sma_20, sma_50, sma_200)
@@ -273,11 +676,19 @@ class FinancialAnalyzer:
             print(f"Error in technical analysis: {str(e)}")
             return TechnicalMetrics()
     
+    def analyze_technicals_many(self, symbols: List[str]) -> Dict[str, TechnicalMetrics]:
+        """Perform technical analysis for several symbols from one batched download"""
+        symbols = list(dict.fromkeys(symbol.upper() for symbol in symbols))
+        if not symbols:
+            return {}
+        
+        self.prefetch_history(symbols, "6mo")
+        return dict(zip(symbols, self._map_symbols(self.analyze_technicals, symbols)))
+    
     def analyze_sentiment(self, symbol: str) -> SentimentMetrics:
         """Perform comprehensive sentiment analysis"""
         try:
-            ticker = yf.Ticker(symbol)
-            info = ticker.info
+            info = self.get_info(symbol)
             company_name = info.get('longName', symbol)
             
             # Get analyst recommendations (baseline)
@@ -349,7 +760,7 @@ class FinancialAnalyzer:
             print(f"Error in sentiment analysis: {str(e)}")
             return SentimentMetrics()
     
-    def generate_recommendation(self, symbol: str, fundamentals: FundamentalMetrics, 
+    def generate_recommendation(self, stock_data: StockData, fundamentals: FundamentalMetrics, 
                               technicals: TechnicalMetrics, sentiment: SentimentMetrics) -> Recommendation:
         """Generate final recommendation"""
         
@@ -365,20 +776,14 @@ class FinancialAnalyzer:
         )
         
         # Determine action
-        if overall_score >= 80:
-            action = "STRONG_BUY"
-        elif overall_score >= 65:
-            action = "BUY"
-        elif overall_score >= 35:
-            action = "HOLD"
-        elif overall_score >= 20:
-            action = "SELL"
-        else:
-            action = "STRONG_SELL"
+        action = _ACTIONS[bisect.bisect_right(_ACTION_THRESHOLDS, overall_score)]
         
         # Calculate confidence based on consensus
-        scores = [fundamentals.score, technicals.score, sentiment.score]
-        confidence = 100 - (np.std(scores) * 2)  # Lower std = higher confidence
+        # Population std of the three scores, inline rather than np.std on a 3-element list
+        mean = (fundamentals.score + technicals.score + sentiment.score) / 3
+        std = math.sqrt(((fundamentals.score - mean) ** 2 + (technicals.score - mean) ** 2 +
+                         (sentiment.score - mean) ** 2) / 3)
+        confidence = 100 - (std * 2)  # Lower std = higher confidence
         confidence = max(20, min(95, confidence))  # Clamp between 20-95
         
         # Generate reasoning
@@ -399,7 +804,7 @@ class FinancialAnalyzer:
             reasoning.append("Negative market sentiment")
         
         # Simple price target calculation
-        current_price = yf.Ticker(symbol).history(period="1d")['Close'].iloc[-1]
+        current_price = stock_data.current_price
         price_target = None
         if action in ["BUY", "STRONG_BUY"]:
             price_target = current_price * (1 + (overall_score - 50) / 500)
@@ -407,7 +812,7 @@ class FinancialAnalyzer:
             price_target = current_price * (1 - (50 - overall_score) / 500)
         
         # Risk level
-        risk_level = "LOW" if confidence > 80 else "MEDIUM" if confidence > 60 else "HIGH"
+        risk_level = _RISK_LEVELS[bisect.bisect_left(_RISK_THRESHOLDS, confidence)]
         
         return Recommendation(
             action=action,
@@ -418,39 +823,18 @@ class FinancialAnalyzer:
             overall_score=round(overall_score, 1)
         )
     
-    def _calculate_rsi(self, prices: pd.Series, period: int = 14) -> Optional[float]:
-        """Calculate RSI indicator"""
-        try:
-            delta = prices.diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-            rs = gain / loss
-            rsi = 100 - (100 / (1 + rs))
-            return rsi.iloc[-1]
-        except:
-            return None
-    
-    def _calculate_macd(self, prices: pd.Series) -> Tuple[Optional[float], Optional[float]]:
-        """Calculate MACD indicator"""
-        try:
-            ema_12 = prices.ewm(span=12).mean()
-            ema_26 = prices.ewm(span=26).mean()
-            macd = ema_12 - ema_26
-            signal = macd.ewm(span=9).mean()
-            return macd.iloc[-1], signal.iloc[-1]
-        except:
-            return None, None
-    
-    def _calculate_bollinger_bands(self, prices: pd.Series, period: int = 20) -> Tuple[Optional[float], Optional[float]]:
-        """Calculate Bollinger Bands"""
-        try:
-            sma = prices.rolling(window=period).mean()
-            std = prices.rolling(window=period).std()
-            upper = sma + (std * 2)
-            lower = sma - (std * 2)
-            return upper.iloc[-1], lower.iloc[-1]
-        except:
-            return None, None
+    def analyze(self, symbol: str) -> Tuple[StockData, FundamentalMetrics, TechnicalMetrics,
+                                            SentimentMetrics, Recommendation]:
+        """Run the full pipeline, fetching the independent stages concurrently"""
+        with ThreadPoolExecutor(max_workers=4, thread_name_prefix="analyze") as pool:
+            stock_data = pool.submit(self.get_stock_data, symbol)
+            fundamentals = pool.submit(self.analyze_fundamentals, symbol)
+            technicals = pool.submit(self.analyze_technicals, symbol)
+            sentiment = pool.submit(self.analyze_sentiment, symbol)
+            stock_data = stock_data.result()
+            fundamentals, technicals, sentiment = fundamentals.result(), technicals.result(), sentiment.result()
+        recommendation = self.generate_recommendation(stock_data, fundamentals, technicals, sentiment)
+        return stock_data, fundamentals, technicals, sentiment, recommendation
     
     def _determine_trend(self, current: float, sma_20: float, sma_50: float, sma_200: Optional[float]) -> str:
         """Determine price trend"""
@@ -475,92 +859,46 @@ class FinancialAnalyzer:
     
     def _calculate_fundamental_score(self, fundamentals: FundamentalMetrics) -> float:
         """Calculate fundamental analysis score (0-100)"""
-        score = 50  # Base score
-        
-        # P/E ratio scoring
-        if fundamentals.pe_ratio:
-            if fundamentals.pe_ratio < 15:
-                score += 10
-            elif fundamentals.pe_ratio < 25:
-                score += 5
-            elif fundamentals.pe_ratio > 40:
-                score -= 10
-        
-        # ROE scoring
-        if fundamentals.roe:
-            if fundamentals.roe > 20:
-                score += 15
-            elif fundamentals.roe > 15:
-                score += 10
-            elif fundamentals.roe > 10:
-                score += 5
-            elif fundamentals.roe < 5:
-                score -= 10
-        
-        # Debt-to-equity scoring
-        if fundamentals.debt_to_equity:
-            if fundamentals.debt_to_equity < 0.3:
-                score += 10
-            elif fundamentals.debt_to_equity < 0.6:
-                score += 5
-            elif fundamentals.debt_to_equity > 1.0:
-                score -= 10
-        
-        # Revenue growth scoring
-        if fundamentals.revenue_growth:
-            if fundamentals.revenue_growth > 20:
-                score += 15
-            elif fundamentals.revenue_growth > 10:
-                score += 10
-            elif fundamentals.revenue_growth > 5:
-                score += 5
-            elif fundamentals.revenue_growth < 0:
-                score -= 10
-        
-        return max(0, min(100, score))
+        return _fundamental_score(
+            _metric(fundamentals.pe_ratio),
+            _metric(fundamentals.roe),
+            _metric(fundamentals.debt_to_equity),
+            _metric(fundamentals.revenue_growth)
+        )
     
-    def _calculate_technical_score(self, technicals: TechnicalMetrics, current_price: float) -> float:
-        """Calculate technical analysis score (0-100)"""
-        score = 50  # Base score
-        
-        # RSI scoring
-        if technicals.rsi:
-            if 40 <= technicals.rsi <= 60:
-                score += 10  # Neutral zone
-            elif 30 <= technicals.rsi <= 40:
-                score += 5   # Slightly oversold
-            elif technicals.rsi < 30:
-                score += 15  # Oversold (buy signal)
-            elif 60 <= technicals.rsi <= 70:
-                score += 5   # Slightly overbought
-            elif technicals.rsi > 70:
-                score -= 10  # Overbought (sell signal)
-        
-        # Trend scoring
-        trend_scores = {
-            "STRONG_BULLISH": 20,
-            "BULLISH": 15,
-            "NEUTRAL": 0,
-            "BEARISH": -15,
-            "STRONG_BEARISH": -20
-        }
-        score += trend_scores.get(technicals.trend, 0)
+    def _score_fundamentals_vec(self, panel: pd.DataFrame) -> np.ndarray:
+        """Vectorized _calculate_fundamental_score over a metrics panel (missing or zero metrics are skipped)"""
+        def column(name: str) -> np.ndarray:
+            values = panel[name].to_numpy(dtype=np.float64)
+            return np.where(values == 0, np.nan, values)
         
-        # MACD scoring
-        if technicals.macd and technicals.macd_signal:
-            if technicals.macd > technicals.macd_signal:
-                score += 10  # Bullish crossover
-            else:
-                score -= 5   # Bearish crossover
-        
-        # Moving average scoring
-        if technicals.sma_20 and technicals.sma_50:
-            if current_price > technicals.sma_20 > technicals.sma_50:
-                score += 10
-            elif current_price < technicals.sma_20 < technicals.sma_50:
-                score -= 10
+        pe = column('pe_ratio')
+        roe = column('roe')
+        debt_to_equity = column('debt_to_equity')
+        revenue_growth = column('revenue_growth')
         
-        return max(0, min(100, score))
+        # NaN fails every comparison, so missing metrics fall through to the 0 default
+        score = (
+            50.0
+            + np.select([pe < 15, pe < 25, pe > 40], [10, 5, -10], 0)
+            + np.select([roe > 20, roe > 15, roe > 10, roe < 5], [15, 10, 5, -10], 0)
+            + np.select([debt_to_equity < 0.3, debt_to_equity < 0.6, debt_to_equity > 1.0], [10, 5, -10], 0)
+            + np.select([revenue_growth > 20, revenue_growth > 10, revenue_growth > 5, revenue_growth < 0],
+                        [15, 10, 5, -10], 0)
+        )
+        return np.clip(score, 0.0, 100.0)
+    
+    def _calculate_technical_score(self, technicals: TechnicalMetrics, current_price: float) -> float:
+        """Calculate technical analysis score (0-100)"""
+        return _technical_score(
+            _metric(technicals.rsi),
+            float(_TREND_SCORES.get(technicals.trend, 0)),
+            _metric(technicals.macd),
+            _metric(technicals.macd_signal),
+            float(current_price),
+            _metric(technicals.sma_20),
+            _metric(technicals.sma_50)
+        )
 
 
 # Example usage and testing
@@ -572,11 +910,7 @@ if __name__ == "__main__":
         symbol = "AAPL"
         print(f"Analyzing {symbol}...")
         
-        stock_data = analyzer.get_stock_data(symbol)
-        fundamentals = analyzer.analyze_fundamentals(symbol)
-        technicals = analyzer.analyze_technicals(symbol)
-        sentiment = analyzer.analyze_sentiment(symbol)
-        recommendation = analyzer.generate_recommendation(symbol, fundamentals, technicals, sentiment)
+        stock_data, fundamentals, technicals, sentiment, recommendation = analyzer.analyze(symbol)
         
         print(f"Stock: {stock_data.name} ({stock_data.symbol})")
         print(f"Price: ${stock_data.current_price} ({stock_data.change_percent:+.2f}%)")
@@ -25,7 +25,7 @@ class FinancialAgentRich:
     def __init__(self):
         self.console = Console()
         self.analyzer = FinancialAnalyzer()
-        self.comprehensive_analyzer = ComprehensiveAnalyzer()
+        self.comprehensive_analyzer = ComprehensiveAnalyzer(self.analyzer)
         self.watchlist = []
         
     def show_banner(self):
@@ -164,7 +164,7 @@ class FinancialAgentRich:
                 # Generate recommendation
                 progress.update(task, description="Generating recommendation...", advance=10)
                 recommendation = self.analyzer.generate_recommendation(
-                    symbol, fundamentals, technicals, sentiment
+                    stock_data, fundamentals, technicals, sentiment
                 )
                 time.sleep(0.2)
             
@@ -460,11 +460,7 @@ class FinancialAgentRich:
                 
                 # Perform basic analysis first
                 progress.update(task, description="📊 Basic financial analysis...", advance=20)
-                stock_data = self.analyzer.get_stock_data(symbol)
-                fundamentals = self.analyzer.analyze_fundamentals(symbol)
-                technicals = self.analyzer.analyze_technicals(symbol)
-                sentiment = self.analyzer.analyze_sentiment(symbol)
-                recommendation = self.analyzer.generate_recommendation(symbol, fundamentals, technicals, sentiment)
+                stock_data, fundamentals, technicals, sentiment, recommendation = self.analyzer.analyze(symbol)
                 
                 # Perform comprehensive analysis
                 progress.update(task, description="🧠 Advanced analysis...", advance=80)
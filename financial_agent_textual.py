@@ -120,7 +120,7 @@ class FinancialAgentTUI(App):
     def __init__(self):
         super().__init__()
         self.analyzer = FinancialAnalyzer()
-        self.comprehensive_analyzer = ComprehensiveAnalyzer()
+        self.comprehensive_analyzer = ComprehensiveAnalyzer(self.analyzer)
         self.title = "Financial Research Agent (Textual)"
         self.sub_title = "Advanced Stock Analysis TUI"
         
@@ -309,7 +309,7 @@ class FinancialAgentTUI(App):
             # Generate recommendation
             self.call_from_thread(self.update_status, f"Generating recommendation...")
             self.recommendation = self.analyzer.generate_recommendation(
-                self.current_symbol, self.fundamentals, self.technicals, self.sentiment
+                self.stock_data, self.fundamentals, self.technicals, self.sentiment
             )
             self.call_from_thread(self.update_progress, 100)
             
@@ -0,0 +1,17 @@
+"""
+Gunicorn configuration for serving the FastAPI app with multiple workers
+Usage: gunicorn -c gunicorn_conf.py api.index:app
+"""
+import multiprocessing
+import os
+
+# One worker per core lifts the single-process GIL ceiling on analyzer work; capped at 4 since
+# every worker carries its own analyzer pool and caches
+workers = int(os.environ.get("WEB_CONCURRENCY", min(multiprocessing.cpu_count(), 4)))
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# Import the app once in the master so analyzer globals are shared copy-on-write
+preload_app = True
+
+bind = f"{os.environ.get('HOST', '0.0.0.0')}:{os.environ.get('PORT', 8000)}"
+timeout = 60
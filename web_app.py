@@ -61,7 +61,7 @@ st.markdown("""
 class WebFinancialAgent:
     def __init__(self):
         self.analyzer = FinancialAnalyzer()
-        self.comprehensive_analyzer = ComprehensiveAnalyzer()
+        self.comprehensive_analyzer = ComprehensiveAnalyzer(self.analyzer)
     
     def get_rating_color(self, rating: str) -> str:
         """Get color class for rating"""
@@ -469,13 +469,7 @@ def main():
                 agent = st.session_state.agent
                 
                 # Basic analysis
-                stock_data = agent.analyzer.get_stock_data(symbol)
-                fundamentals = agent.analyzer.analyze_fundamentals(symbol)
-                technicals = agent.analyzer.analyze_technicals(symbol)
-                sentiment = agent.analyzer.analyze_sentiment(symbol)
-                recommendation = agent.analyzer.generate_recommendation(
-                    symbol, fundamentals, technicals, sentiment
-                )
+                stock_data, fundamentals, technicals, sentiment, recommendation = agent.analyzer.analyze(symbol)
                 
                 # Comprehensive analysis if selected
                 comprehensive_analysis = None